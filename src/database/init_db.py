@@ -1,9 +1,62 @@
 import sqlite3
-from src.utils.config import DB_PATH
+from src.utils.config import DB_PATH, SQLITE_INIT_PRAGMAS
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Prepared statements kept per connection (sqlite3 default is 128), keyed on the SQL string
+SQLITE_CACHED_STATEMENTS = 256
+
+# PRAGMA user_version of a database whose aggregated_results only holds totals written after the
+# sheet update succeeded; older databases are reset once by _reset_legacy_aggregated_results
+AGGREGATED_RESULTS_VERSION = 1
+
+# Bets that passed OCR validation or review must have scores and odds within VALID_RANGES
+# in constants.py; rows still needing review or voided may hold anything OCR read.
+# Future dates are still checked by BetProcessor.validate_full because CHECK can't use date('now').
+RAW_OCR_BETS_TABLE = """
+CREATE TABLE IF NOT EXISTS {table} (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    player_id INTEGER,
+    bet_type TEXT,
+    score REAL,
+    date DATE,
+    bet_line TEXT,
+    odds INTEGER, 
+    image_source TEXT,
+    raw_text TEXT NOT NULL,
+    read_players TEXT,
+    read_score_patterns TEXT,
+    is_processed BOOLEAN DEFAULT 0,
+    needs_review BOOLEAN DEFAULT 0,
+    is_voided BOOLEAN DEFAULT 0,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (player_id) REFERENCES players(nba_api_id),
+    UNIQUE(player_id, date, bet_type, score), --Players can have multiple bets of same type
+    CONSTRAINT valid_score CHECK (needs_review = 1 OR is_voided = 1 OR score BETWEEN 20 AND 100),
+    CONSTRAINT valid_odds CHECK (needs_review = 1 OR is_voided = 1 OR odds BETWEEN -1000 AND 1000)
+);
+"""
+
+def connect_db(db_file: str = DB_PATH, **kwargs) -> sqlite3.Connection:
+    """Open a connection to the database with the tuned SQLITE_INIT_PRAGMAS applied.
+
+    Args:
+        db_file: Path to the database file, the app database by default
+        **kwargs: Passed through to sqlite3.connect
+
+    Returns:
+        sqlite3.Connection: Configured connection
+    """
+    kwargs.setdefault('cached_statements', SQLITE_CACHED_STATEMENTS)
+    conn = sqlite3.connect(db_file, **kwargs)
+    for pragma in SQLITE_INIT_PRAGMAS:
+        conn.execute(f"PRAGMA {pragma}")
+    return conn
 
 def init_database():
     """Initialize the SQLite database with required tables."""
-    conn = sqlite3.connect(DB_PATH)
+    conn = connect_db()
     
     conn.execute("""
     CREATE TABLE IF NOT EXISTS players (
@@ -14,28 +67,39 @@ def init_database():
     """)
 
 
+    conn.execute(RAW_OCR_BETS_TABLE.format(table="raw_ocr_bets"))
+    _ensure_schema(conn)
+
+    # Image lookups/deletes by image_source, and the reviewed-image check in process_folder
+    # (partial index only covers rows that don't need review)
+    # game_stats(player_id, date) and bet_results(raw_bet_id) are already indexed by their UNIQUE constraints
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_raw_ocr_bets_image_source ON raw_ocr_bets(image_source)")
     conn.execute("""
-    CREATE TABLE IF NOT EXISTS raw_ocr_bets (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        player_id INTEGER,
-        bet_type TEXT,
-        score REAL,
-        date DATE,
-        bet_line TEXT,
-        odds INTEGER, 
-        image_source TEXT,
+    CREATE INDEX IF NOT EXISTS idx_raw_ocr_bets_needs_review_image
+    ON raw_ocr_bets(needs_review, image_source) WHERE needs_review = 0
+    """)
+    # Unprocessed bet lookup in BetProcessor
+    conn.execute("""
+    CREATE INDEX IF NOT EXISTS idx_raw_ocr_bets_status
+    ON raw_ocr_bets(is_processed, is_voided, needs_review)
+    """)
+    # Entries needing review in ReviewHandler and reprocess_flagged_entries
+    # (player_id lookups are covered by the UNIQUE(player_id, date, bet_type, score) index)
+    conn.execute("""
+    CREATE INDEX IF NOT EXISTS idx_raw_ocr_bets_review
+    ON raw_ocr_bets(needs_review, is_voided)
+    """)
+
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS ocr_cache (
+        file_hash TEXT PRIMARY KEY,  -- xxh3_64 of the image file contents
         raw_text TEXT NOT NULL,
-        read_players TEXT,
-        read_score_patterns TEXT,
-        is_processed BOOLEAN DEFAULT 0,
-        needs_review BOOLEAN DEFAULT 0,
-        is_voided BOOLEAN DEFAULT 0,
-        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-        FOREIGN KEY (player_id) REFERENCES players(nba_api_id),
-        UNIQUE(player_id, date, bet_type, score) --Players can have multiple bets of same type
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
     );
     """)
 
+    # Stats stay REAL: SQLite already writes whole-number REAL values to disk as small integers
+    # (1-2 bytes each) and converts them back on read, so INTEGER columns wouldn't shrink rows
     conn.execute("""
     CREATE TABLE IF NOT EXISTS game_stats (
         id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -73,12 +137,14 @@ def init_database():
         line_value REAL NOT NULL, -- Line being bet (e.g. 6.5 in o6.5)
         is_uploaded BOOLEAN DEFAULT 0,
         processed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        date DATE, -- Copy of raw_ocr_bets.date, so uploads don't need the join (last, like the column added by _ensure_bet_results_date)
         FOREIGN KEY (raw_bet_id) REFERENCES raw_ocr_bets(id) ON DELETE CASCADE,
         FOREIGN KEY (player_id) REFERENCES players(nba_api_id),
         FOREIGN KEY (game_stats_id) REFERENCES game_stats(id),
         UNIQUE(raw_bet_id) -- Each bet has one result
     );
     """)
+    _ensure_bet_results_date(conn)
 
     conn.execute("""
     CREATE TABLE IF NOT EXISTS unplayed_bets (
@@ -92,6 +158,14 @@ def init_database():
     );
     """)
 
+    # Unplayed player/date lookups
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_unplayed_bets_player_date ON unplayed_bets(player_id, date)")
+    # Covers the unuploaded result aggregation in upload_to_sheets
+    conn.execute("""
+    CREATE INDEX IF NOT EXISTS idx_bet_results_unuploaded
+    ON bet_results(is_uploaded, bet_type, score_range, result_delta)
+    """)
+
     conn.execute("""
     CREATE TABLE IF NOT EXISTS aggregated_results (
         sheet_cell TEXT PRIMARY KEY NOT NULL,
@@ -103,9 +177,95 @@ def init_database():
         processed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
     );
     """)
+    _reset_legacy_aggregated_results(conn)
 
     conn.commit()
+    conn.execute("PRAGMA optimize")
     conn.close()
 
+def _ensure_schema(conn: sqlite3.Connection) -> None:
+    """Rebuild a raw_ocr_bets table created before its CHECK constraints existed.
+
+    SQLite can't add constraints with ALTER TABLE, so the table is copied into a new one
+    with foreign keys off (dropping it with them on would cascade into bet_results).
+    Unprocessed reviewed rows that would fail the new checks are flagged for review again first.
+    Processed rows have already been scored, so they are logged and copied as they are.
+    Indexes are recreated afterwards by init_database.
+    """
+    table_sql = conn.execute(
+        "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'raw_ocr_bets'"
+    ).fetchone()[0]
+    if 'valid_score' in table_sql:
+        return
+
+    logger.info("Adding score and odds constraints to raw_ocr_bets")
+    conn.commit()
+    conn.execute("PRAGMA foreign_keys=OFF")
+    try:
+        with conn:
+            flagged = conn.execute("""
+            UPDATE raw_ocr_bets
+            SET needs_review = 1
+            WHERE needs_review = 0 AND is_voided = 0 AND is_processed = 0
+            AND (score < 20 OR score > 100 OR odds < -1000 OR odds > 1000)
+            """).rowcount
+            if flagged:
+                logger.warning(f"Flagged {flagged} bets with out of range scores or odds for review")
+
+            # Sending processed bets back to review would leave them is_processed = 1 AND needs_review = 1
+            scored_ids = [row[0] for row in conn.execute("""
+            SELECT id FROM raw_ocr_bets
+            WHERE needs_review = 0 AND is_voided = 0 AND is_processed = 1
+            AND (score < 20 OR score > 100 OR odds < -1000 OR odds > 1000)
+            """)]
+            if scored_ids:
+                logger.warning(
+                    f"Keeping {len(scored_ids)} processed bets with out of range scores or odds: {scored_ids}"
+                )
+
+            conn.execute(RAW_OCR_BETS_TABLE.format(table="raw_ocr_bets_new"))
+            # Only those already scored rows can fail the new checks here
+            conn.execute("PRAGMA ignore_check_constraints=ON")
+            conn.execute("INSERT INTO raw_ocr_bets_new SELECT * FROM raw_ocr_bets")
+            conn.execute("PRAGMA ignore_check_constraints=OFF")
+            conn.execute("DROP TABLE raw_ocr_bets")
+            conn.execute("ALTER TABLE raw_ocr_bets_new RENAME TO raw_ocr_bets")
+
+            violations = conn.execute("PRAGMA foreign_key_check").fetchall()
+            if violations:
+                logger.warning(f"Foreign key violations found after rebuilding raw_ocr_bets: {violations}")
+    finally:
+        conn.execute("PRAGMA ignore_check_constraints=OFF")
+        conn.execute("PRAGMA foreign_keys=ON")
+
+def _ensure_bet_results_date(conn: sqlite3.Connection) -> None:
+    """Add the date column to a bet_results table created before it existed, filled in from raw_ocr_bets."""
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(bet_results)")}
+    if 'date' in columns:
+        return
+
+    logger.info("Adding date column to bet_results")
+    with conn:
+        conn.execute("ALTER TABLE bet_results ADD COLUMN date DATE")
+        conn.execute("""
+        UPDATE bet_results
+        SET date = (SELECT r.date FROM raw_ocr_bets r WHERE r.id = bet_results.raw_bet_id)
+        """)
+
+def _reset_legacy_aggregated_results(conn: sqlite3.Connection) -> None:
+    """Clear aggregated_results in a database written before it was trusted as the sheet's totals.
+
+    Uploads used to save totals before writing them to the sheet, and on dry runs too, so old rows
+    may be ahead of the sheet. With them gone, the next upload reads each cell from the sheet once.
+    """
+    if conn.execute("PRAGMA user_version").fetchone()[0] >= AGGREGATED_RESULTS_VERSION:
+        return
+
+    with conn:
+        cleared = conn.execute("DELETE FROM aggregated_results").rowcount
+        conn.execute(f"PRAGMA user_version = {AGGREGATED_RESULTS_VERSION}")
+    if cleared:
+        logger.info(f"Cleared {cleared} legacy aggregated results; the next upload rereads them from Google Sheet")
+
 if __name__ == "__main__":
     init_database()
\ No newline at end of file
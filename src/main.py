@@ -5,9 +5,8 @@ Main entry point for the NBA Props Analyzer.
 import argparse
 from pathlib import Path
 
-from src.ocr.image_processor import ImageProcessor
-from src.processing.process_bets import BetProcessor
-from src.utils.upload_bets import upload_to_sheets
+# Pipeline stages are imported inside their entry functions so skipped stages
+# (and --help) don't pay for importing torch, easyocr, nba_api, or gspread
 from src.utils.logger import setup_logger
     
 logger = setup_logger(__name__)
@@ -23,10 +22,15 @@ def process_images(folder_path: str, year: int, reprocess: bool = False) -> bool
     Returns:
         bool: True if processing completed successfully
     """
+    from src.ocr.image_processor import ImageProcessor
+
     ocr_processor = ImageProcessor()
-    if reprocess:
-        return ocr_processor.reprocess_flagged_entries()
-    return ocr_processor.process_folder(folder_path, year)
+    try:
+        if reprocess:
+            return ocr_processor.reprocess_flagged_entries(year, folder_path)
+        return ocr_processor.process_folder(folder_path, year)
+    finally:
+        ocr_processor.close()
 
 def update_database() -> bool:
     """Process unprocessed bets and update database with results.
@@ -34,18 +38,25 @@ def update_database() -> bool:
     Returns:
         bool: True if database update completed successfully
     """
+    from src.processing.process_bets import BetProcessor
+
     processor = BetProcessor()
     return processor.process_new_bets()
 
-def upload_results(dry_run: bool = False) -> bool:
+def upload_results(dry_run: bool = False, force: bool = False) -> bool:
     """Upload processed results to Google Sheets.
     
     Args:
         dry_run: If True, log changes without applying them
+        force: If True, upload even if the pending batch is still small
         
     Returns:
         bool: True if upload completed successfully
     """
+    from src.utils.upload_bets import upload_to_sheets
+
+    if force:
+        return upload_to_sheets(dry_run, min_batch=0)
     return upload_to_sheets(dry_run)
 
 def main():
@@ -58,6 +69,7 @@ def main():
     parser.add_argument('--skip-ocr', action='store_true', help='Skip OCR processing')
     parser.add_argument('--skip-update', action='store_true', help='Skip database update')
     parser.add_argument('--skip-upload', action='store_true', help='Skip upload to sheets')
+    parser.add_argument('--force-upload', action='store_true', help='Upload to sheets even if only a few results are pending')
     parser.add_argument('--reprocess', action='store_true', help='Reprocess entries marked for review')
     
     args = parser.parse_args()
@@ -80,7 +92,7 @@ def main():
                 
         # Upload to sheets if not skipped
         if not args.skip_upload:
-            if not upload_results(args.dry_run):
+            if not upload_results(args.dry_run, args.force_upload):
                 logger.error("Exiting due to upload failure")
                 return
                 
@@ -5,26 +5,48 @@ Image processing module for OCR extraction of betting slip data.
 import re
 import os
 import json
-from typing import Optional, List, Dict, Any
+import sqlite3
+import contextlib
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Optional, List, Dict, Any, Tuple, Iterator
 
+import ahocorasick
+import numpy as np
 import pandas as pd
-import sqlite3
-import easyocr
-import torch
-from nba_api.stats.static import players
+import xxhash
 
-from src.database.init_db import init_database
-from src.utils.config import DB_PATH, IMAGES_DIR
+from src.database.init_db import init_database, connect_db
+from src.utils.config import IMAGES_DIR
 from src.utils.constants import (
     NAME_REPLACEMENTS,
     TYPE_REPLACEMENTS,
+    VALID_BET_TYPES,
     ORDERED_OCR_BET_TYPES,
-    VALID_RANGES
+    VALID_RANGES,
+    OCR_IMAGE_BATCH_SIZE,
+    OCR_RECOGNIZER_BATCH_SIZE,
+    OCR_CPU_WORKERS,
+    OCR_GPU_WORKERS
 )
 from src.utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Date M/DD or MM/DD, or score, line, and odds in one pattern to ignore bets with scores < 20
+_BET_RE = re.compile(
+    r'(?P<date>\b\d{1,2}/\d{2}\b)'
+    r'|(?P<score>\+[2-9]\d\s*\.\s*\d{2}%)\s*(?P<line>[0|u|o]\d*\s*+\.\s*5)\s*(?P<odds>[\-|\+|7|4|~|"]\d{3})'
+)
+# Valid bet line, e.g. o21.5 or u6.5
+_BET_LINE_RE = re.compile(r'^[ou]\d+\.5$')
+# Spaces around '+' in bet types, e.g. "Pts + Reb"
+_PLUS_SPACING_RE = re.compile(r'\s*\+\s*')
+# Common OCR errors in odds and bet lines
+_ODDS_LEADING_MINUS_RE = re.compile(r'^[74~"]')
+_ODDS_INNER_MINUS_RE = re.compile(r'(?<!^)-')
+_LINE_LEADING_ZERO_RE = re.compile(r'^0')
+
 class ImageProcessor:
     """Handles OCR (Optical Character Recognition) processing of betting slip images and database operations.
     
@@ -38,6 +60,7 @@ class ImageProcessor:
     Database Tables:
         - raw_ocr_bets: Stores processed bet data from OCR 
         - players: Maintains active player list and IDs
+        - ocr_cache: OCR text keyed by hash of the image file, so unchanged images are never OCR'd twice
     """
     
     def __init__(self) -> None:
@@ -45,11 +68,22 @@ class ImageProcessor:
             - Initializes database schema if it doesn't exists
             - Creates players and raw_ocr_bets tables
             - Fills players table with active NBA players and their IDs
+            - Opens a single connection reused for all database operations
         """
         init_database()
-        self.reader = self._init_ocr_reader()
+        # Autocommit mode; writes that span multiple statements use explicit transactions
+        self.conn = connect_db(check_same_thread=False, isolation_level=None)
+        self._reader = None  # Loaded on first use, see reader
+        self.bet_type_automaton = self._build_automaton(ORDERED_OCR_BET_TYPES, TYPE_REPLACEMENTS)
         self._cache_player_data()
 
+    @property
+    def reader(self) -> 'easyocr.Reader':
+        """OCR reader, initialized on first use so runs that don't OCR skip importing torch and easyocr."""
+        if self._reader is None:
+            self._reader = self._init_ocr_reader()
+        return self._reader
+
     def process_folder(self, folder_path: str, year: int) -> bool:
         """Process all images in a folder.
         
@@ -65,16 +99,80 @@ class ImageProcessor:
         processed_count = 0
         
         logger.info(f"Starting folder processing: {folder_path}")
-        for filename in os.listdir(folder_path):
-            if filename.lower().endswith(('.png', '.jpg', '.jpeg')):
-                file_path = os.path.join(folder_path, filename)
-                result = self.process_image(file_path)
-                if result is not None:
-                    processed_count += len(result)
+        with os.scandir(folder_path) as it:
+            entries = sorted(
+                (entry for entry in it
+                 if entry.is_file() and entry.name.lower().endswith(('.png', '.jpg', '.jpeg'))),
+                key=lambda entry: entry.name
+            )
+
+        # Use existing data if it exists and doesn't need review; OCR the rest in batches
+        reviewed_counts = self._get_reviewed_image_counts()
+        # {file path: image name} for images that need OCR
+        ocr_names = {}
+        for entry in entries:
+            if entry.name in reviewed_counts:
+                processed_count += reviewed_counts[entry.name]
+            else:
+                ocr_names[entry.path] = entry.name
+        logger.info(f"Using existing data for {len(entries) - len(ocr_names)} images")
+        self._delete_image_data(list(ocr_names.values()))
+
+        for file_path, raw_text in self._get_ocr_texts(list(ocr_names)):
+            image_name = ocr_names[file_path]
+            logger.info(f"Processing image: {image_name}", exc_info=False)
+            result = self._process_ocr_text(image_name, raw_text)
+            if result is not None:
+                processed_count += len(result)
         
         logger.info(f"Completed processing {processed_count} bets from {folder_path}")
         return True
 
+    def reprocess_flagged_entries(self, year: int, folder_path: Optional[str] = None) -> bool:
+        """Reprocess images with entries marked for review, e.g. after updating NAME_REPLACEMENTS.
+
+        Uses the raw_text stored in raw_ocr_bets instead of re-running OCR. Images are only
+        OCR'd again if their stored text is empty.
+
+        Args:
+            year: Year to use for date processing
+            folder_path: Directory containing the images, only needed for the OCR fallback
+            (defaults to IMAGES_DIR)
+
+        Returns:
+            True if reprocessing completed (even if some images failed)
+        """
+        self.year = year
+        flagged_images = self.conn.execute("""
+        SELECT image_source, MAX(raw_text) FROM raw_ocr_bets
+        WHERE needs_review = 1 AND is_voided = 0
+        GROUP BY image_source
+        """).fetchall()
+        logger.info(f"Reprocessing {len(flagged_images)} images marked for review")
+
+        processed_count = 0
+        for image_name, raw_text in flagged_images:
+            logger.info(f"Reprocessing image: {image_name}", exc_info=False)
+            if not raw_text:
+                file_path = os.path.join(folder_path or IMAGES_DIR, image_name)
+                if not os.path.exists(file_path):
+                    logger.error(f"No stored text and image not found: {file_path}")
+                    continue
+                raw_text = self._get_ocr_text(file_path)
+
+            # The flagged entries are only replaced once new entries are extracted and saved
+            result = self._process_ocr_text(image_name, raw_text, replace_flagged=True)
+            if result is not None:
+                processed_count += len(result)
+
+        logger.info(f"Completed reprocessing {processed_count} bets")
+        return True
+
+    def close(self) -> None:
+        """Optimize and close the database connection."""
+        self.conn.execute("PRAGMA optimize")
+        self.conn.close()
+
     def process_image(self, file_path: str) -> Optional[pd.DataFrame]:
         """Process a single image and save results to database.
 
@@ -88,33 +186,45 @@ class ImageProcessor:
         image_name = os.path.basename(file_path)
         logger.info(f"Processing image: {image_name}", exc_info=False)
         
-        with sqlite3.connect(DB_PATH) as conn:
-            # Return existing data if it exists and doesn't need review
-            existing_data = self._get_existing_data(conn, image_name)
-            if existing_data is not None:
-                return existing_data
-            
-            raw_text = self._get_ocr_text(file_path)
-            if not raw_text:
-                return None
+        # Return existing data if it exists and doesn't need review
+        existing_data = self._get_existing_data(image_name)
+        if existing_data is not None:
+            return existing_data
+        
+        raw_text = self._get_ocr_text(file_path)
+        return self._process_ocr_text(image_name, raw_text)
 
-            try:
-                extracted_data = self._extract_bet_data(raw_text)
-                if not extracted_data:
-                    logger.error(f"Failed to extract data from {image_name}")
-                    return None
-
-                extracted_data = pd.DataFrame(extracted_data)
-                extracted_data['image_source'] = image_name
-                
-                cleaned_entries = self.clean_data(extracted_data)
-                self._save_to_database(cleaned_entries)
-                return cleaned_entries
+    def _process_ocr_text(self, image_name: str, raw_text: Optional[str],
+                          replace_flagged: bool = False) -> Optional[pd.DataFrame]:
+        """Extract, clean, and save bet data from the OCR text of an image.
 
-            except Exception as e:
-                logger.error(f"Error processing {image_name}: {str(e)}")
+        Args:
+            image_name: Name of the image the text was read from
+            raw_text: OCR text of the image
+            replace_flagged: If True, the image's entries marked for review are replaced by the new ones
+
+        Returns: fully processed bet data, None if no text or no bet data was found
+        """
+        if not raw_text:
+            return None
+
+        try:
+            extracted_data = self._extract_bet_data(raw_text)
+            if not extracted_data:
+                logger.error(f"Failed to extract data from {image_name}")
                 return None
 
+            extracted_data = pd.DataFrame(extracted_data)
+            extracted_data['image_source'] = image_name
+            
+            cleaned_entries = self.clean_data(extracted_data)
+            self._save_to_database(cleaned_entries, replace_flagged)
+            return cleaned_entries
+
+        except Exception as e:
+            logger.error(f"Error processing {image_name}: {str(e)}")
+            return None
+
     def clean_data(self, extracted_data: pd.DataFrame) -> pd.DataFrame:
         """Clean and standardize extracted betting data, ignoring NA values
 
@@ -133,32 +243,26 @@ class ImageProcessor:
         
         # Remove whitespace in string columns
         for col in ['score', 'odds', 'bet_line']:
-            df.loc[df[col].notna(), col] = df.loc[df[col].notna(), col].apply(lambda x: x.replace(" ", ""))
+            df[col] = df[col].str.replace(' ', '', regex=False)
         
         # Account for common OCR errors in odds
-        df.loc[df['odds'].notna(), 'odds'] = (
-            df.loc[df['odds'].notna(), 'odds']
-            .str.replace(r'^[74~"]', '-', regex=True)  # Fix leading minus signs
-            .str.replace(r'(?<!^)-', '4', regex=True)  # Fix non-leading 4s
-            .astype('Int64')  # Use nullable integer type
-        )
+        df['odds'] = pd.to_numeric(
+            df['odds']
+            .str.replace(_ODDS_LEADING_MINUS_RE, '-', regex=True)  # Fix leading minus signs
+            .str.replace(_ODDS_INNER_MINUS_RE, '4', regex=True)  # Fix non-leading 4s
+        ).astype('Int64')  # Use nullable integer type
         
         # Account for common OCR errors in bet line
-        df.loc[df['bet_line'].notna(), 'bet_line'] = (
-            df.loc[df['bet_line'].notna(), 'bet_line']
-            .str.replace(r'^0', 'o', regex=True)  # Fix 0 vs o confusion
-        )
+        df['bet_line'] = df['bet_line'].str.replace(_LINE_LEADING_ZERO_RE, 'o', regex=True)  # Fix 0 vs o confusion
         
         # Clean score - remove + and %
-        df.loc[df['score'].notna(), 'score'] = (
-            df.loc[df['score'].notna(), 'score']
-            .str[1:-1]  # Remove + and %
-        )
+        df['score'] = df['score'].str.slice(1, -1)
         
-        # Convert dates to YYYY-MM-DD
-        df.loc[df['date'].notna(), 'date'] = pd.to_datetime(
-                df.loc[df['date'].notna(), 'date'].apply(lambda x: f"{x}/{self.year}"),
-                format='%m/%d/%Y'
+        # Convert dates to YYYY-MM-DD, unparseable dates become NA and get flagged for review
+        df['date'] = pd.to_datetime(
+                df['date'] + f"/{self.year}",
+                format='%m/%d/%Y',
+                errors='coerce'
             ).dt.strftime('%Y-%m-%d')
 
         return df
@@ -174,32 +278,35 @@ class ImageProcessor:
             None if no dates or score_lines are found 
         """
 
-        # Extract date M/DD or MM/DD 
-        dates = re.findall(r'\b\d{1,2}/\d{2}\b', raw_text)
+        # Extract dates and score, line, and odds triples in one pass, keeping positional order
+        dates, score_lines = [], []
+        for match in _BET_RE.finditer(raw_text):
+            if match.group('date'):
+                dates.append(match.group('date'))
+            else:
+                score_lines.append(match.group('score', 'line', 'odds'))
+
         if not dates:
             logger.error(f"No date found in {raw_text}")
             return None
 
-        # Extract bet type and standardize
-        bet_type = self._find_bet_type(raw_text) # None if no bet type found
-        bet_type = TYPE_REPLACEMENTS.get(bet_type, bet_type) 
-
-        # Extract score, line, and odds using one pattern to ignore bets with scores < 20
-        score_pattern = r'(\+[2-9]\d\s*\.\s*\d{2}%)\s*([0|u|o]\d*\s*+\.\s*5)\s*([\-|\+|7|4|~|"]\d{3})'
-        score_lines = re.findall(score_pattern, raw_text)
-        
         if not score_lines:
             logger.error(f"No score_lines found in {raw_text}")
             return None
 
+        # Lowercase once for both automaton scans
+        raw_text_lower = raw_text.lower()
+
+        # Extract standardized bet type
+        bet_type = self._find_bet_type(raw_text_lower) # None if no bet type found
+
         # Extract scores, lines, and odds from that one pattern
         scores = [item[0] for item in score_lines]
         lines = [item[1] for item in score_lines]
         odds = [item[2] for item in score_lines]
 
-        # Extract and clean player names
-        players_in_text = self._find_players_in_text(raw_text)
-        players_in_text = [NAME_REPLACEMENTS.get(item, item) for item in players_in_text]
+        # Extract standardized player names
+        players_in_text = self._find_players_in_text(raw_text_lower)
 
         # Make columns NA if they don't match max length as OCR missed something
         max_length = max(len(players_in_text), len(lines), len(scores), len(odds))
@@ -225,29 +332,8 @@ class ImageProcessor:
             'raw_text': raw_text
         } for i in range(max_length)]
 
-    def _image_needs_review(self, image_df: pd.DataFrame) -> tuple[bool, List[str]]:
-        """Determine if an image needs manual review.
-        
-        An image needs review if any bet in it needs review.
-        All bets in an image share the same review status.
-        
-        Args:
-            image_df: DataFrame containing all bets in an image
-            
-        Returns:
-            Tuple of (needs_review, list of reasons for review)
-        """
-        all_reasons = []
-        
-        for _, bet_entry in image_df.iterrows():
-            needs_review, reasons = self._bet_needs_review(bet_entry)
-            if needs_review:
-                all_reasons.extend(reasons)
-        
-        return (len(all_reasons) > 0, all_reasons)
-
-    def _bet_needs_review(self, bet_entry: pd.Series) -> tuple[bool, List[str]]:
-        """Determine if a bet needs manual review.
+    def _validate_df(self, bets_df: pd.DataFrame) -> Tuple[np.ndarray, List[List[str]]]:
+        """Determine which bets need manual review, checking all rows at once.
         
         A bet needs review if any of these conditions are met:
         - Missing or invalid player name
@@ -258,70 +344,67 @@ class ImageProcessor:
         - Date is missing or invalid
         
         Args:
-            bet_entry: Series containing the bet entry data
+            bets_df: DataFrame containing the bet entries
             
         Returns:
-            Tuple of (needs_review, list of reasons for review)
+            Tuple of (needs_review mask, list of reasons for review per row)
         """
-        reasons = set()
+        reasons = [[] for _ in range(len(bets_df))]
 
-        # Check player
-        player_name = bet_entry['player'] if not pd.isna(bet_entry['player']) else None
-        if not player_name:
-            reasons.add("Missing player name")
+        def add_reasons(mask: pd.Series, make_reason) -> None:
+            for i in np.flatnonzero(mask.to_numpy(dtype=bool)):
+                reasons[i].append(make_reason(i))
 
-        # Check player_id
-        if player_name and player_name not in self.player_ids:
-            reasons.add(f"Player not found: {player_name}")
+        # Check player and player_id
+        player = bets_df['player']
+        player_missing = player.isna() | (player.fillna('') == '')
+        add_reasons(player_missing, lambda i: "Missing player name")
+        add_reasons(~player_missing & ~player.isin(self.player_ids),
+                    lambda i: f"Player not found: {player.iat[i]}")
 
         # Check bet type
-        bet_type = bet_entry['bet_type'] if not pd.isna(bet_entry['bet_type']) else None
-        if not bet_type:
-            reasons.add("Missing bet type")
-        elif bet_type not in TYPE_REPLACEMENTS.values():
-            reasons.add(f"Invalid bet type: {bet_type}")
-                
+        bet_type = bets_df['bet_type']
+        bet_type_missing = bet_type.isna() | (bet_type.fillna('') == '')
+        add_reasons(bet_type_missing, lambda i: "Missing bet type")
+        add_reasons(~bet_type_missing & ~bet_type.isin(VALID_BET_TYPES),
+                    lambda i: f"Invalid bet type: {bet_type.iat[i]}")
+
         # Check score
-        if pd.isna(bet_entry['score']):
-            reasons.add("Missing score")
-        else:
-            try:
-                score_lower_bound, score_upper_bound = VALID_RANGES['score']
-                score = float(bet_entry['score'])
-                if not score_lower_bound <= score <= score_upper_bound:
-                    reasons.add(f"Score out of expected range [{score_lower_bound},{score_upper_bound}]: {score}")
-            except ValueError:
-                reasons.add(f"Invalid score format: {bet_entry['score']}")
-                    
+        score_lower_bound, score_upper_bound = VALID_RANGES['score']
+        score_missing = bets_df['score'].isna()
+        score = pd.to_numeric(bets_df['score'], errors='coerce').astype(float)
+        add_reasons(score_missing, lambda i: "Missing score")
+        add_reasons(~score_missing & score.isna(),
+                    lambda i: f"Invalid score format: {bets_df['score'].iat[i]}")
+        add_reasons((score < score_lower_bound) | (score > score_upper_bound),
+                    lambda i: f"Score out of expected range [{score_lower_bound},{score_upper_bound}]: {float(score.iat[i])}")
+
         # Check bet line
-        if pd.isna(bet_entry['bet_line']):
-            reasons.add("Missing bet line")
-        else:
-            if not re.match(r'^[ou]\d+\.5$', str(bet_entry['bet_line'])):
-                reasons.add(f"Invalid bet line format: {bet_entry['bet_line']}")
-                    
+        bet_line_missing = bets_df['bet_line'].isna()
+        bet_line_valid = bets_df['bet_line'].astype(str).str.match(_BET_LINE_RE)
+        add_reasons(bet_line_missing, lambda i: "Missing bet line")
+        add_reasons(~bet_line_missing & ~bet_line_valid,
+                    lambda i: f"Invalid bet line format: {bets_df['bet_line'].iat[i]}")
+
         # Check odds
-        if pd.isna(bet_entry['odds']):
-            reasons.add("Missing odds")
-        else:
-            try:
-                odds = int(bet_entry['odds'])
-                odds_lower_bound, odds_upper_bound = VALID_RANGES['odds']
-                if not odds_lower_bound <= odds <= odds_upper_bound:
-                    reasons.add(f"Odds out of expected range [{odds_lower_bound},{odds_upper_bound}]: {odds}")
-            except ValueError:
-                reasons.add(f"Invalid odds format: {bet_entry['odds']}")
-                    
+        odds_lower_bound, odds_upper_bound = VALID_RANGES['odds']
+        odds_missing = bets_df['odds'].isna()
+        odds = pd.to_numeric(bets_df['odds'], errors='coerce').astype(float)
+        add_reasons(odds_missing, lambda i: "Missing odds")
+        add_reasons(~odds_missing & odds.isna(),
+                    lambda i: f"Invalid odds format: {bets_df['odds'].iat[i]}")
+        add_reasons((odds < odds_lower_bound) | (odds > odds_upper_bound),
+                    lambda i: f"Odds out of expected range [{odds_lower_bound},{odds_upper_bound}]: {int(odds.iat[i])}")
+
         # Check date
-        if pd.isna(bet_entry['date']):
-            reasons.add("Missing date")
-        else:
-            try:
-                pd.to_datetime(bet_entry['date'])
-            except:
-                reasons.add(f"Invalid date format: {bet_entry['date']}")
+        date_missing = bets_df['date'].isna()
+        date = pd.to_datetime(bets_df['date'], format='mixed', errors='coerce')
+        add_reasons(date_missing, lambda i: "Missing date")
+        add_reasons(~date_missing & date.isna(),
+                    lambda i: f"Invalid date format: {bets_df['date'].iat[i]}")
 
-        return (len(reasons) > 0, list(reasons))
+        needs_review = np.array([len(row_reasons) > 0 for row_reasons in reasons], dtype=bool)
+        return (needs_review, reasons)
 
     def _image_needs_review(self, image_df: pd.DataFrame) -> tuple[bool, List[str]]:
         """Determine if an image needs manual review.
@@ -335,100 +418,259 @@ class ImageProcessor:
         Returns:
             Tuple of (needs_review, list of reasons for review)
         """
-        all_reasons = set()
-        
-        for _, bet_entry in image_df.iterrows():
-            needs_review, reasons = self._bet_needs_review(bet_entry)
-            if needs_review:
-                all_reasons.update(reasons)
+        _, reasons = self._validate_df(image_df)
+        all_reasons = set().union(*reasons)
         
         return (len(all_reasons) > 0, list(all_reasons))
 
-    def _save_to_database(self, cleaned_entries: pd.DataFrame) -> None:
+    def _save_to_database(self, cleaned_entries: pd.DataFrame, replace_flagged: bool = False) -> None:
         """ Saves cleaned entries to raw_ocr_bets table 
 
         - Determines if each image needs review
         - Sets needs_review flag based on validation
-        - Inserts each entry into raw_ocr_bets database table  
+        - Inserts the entries of each image into raw_ocr_bets in a single transaction
+        - If replace_flagged, first deletes the image's entries marked for review in that same
+          transaction, so they are kept if the insert fails
         """
         if cleaned_entries.empty:
             logger.warning("No data to save to database")
             return 
         
-        images = cleaned_entries.groupby('image_source')
-
-        with sqlite3.connect(DB_PATH) as conn:
-            for image_name, image_df in images:
-                # Check needs_review on an image level as all bets in the image will have same flag 
-                needs_review, reasons = self._image_needs_review(image_df)
-                if needs_review:
-                    logger.warning(
-                        f"Image needs review: {image_name}\n"
-                        f"Review reasons: {', '.join(reasons)}"
-                    )
-
-                for _, bet_entry in image_df.iterrows():
-                    try:
-                        player_name = bet_entry['player'] if not pd.isna(bet_entry['player']) else None
-                        player_id = self.player_ids.get(player_name) if player_name else None
-                        
-                        # Convert debug variables to JSON strings if they contain valid data
-                        read_score_patterns = (
-                            json.dumps(bet_entry['read_score_patterns']) 
-                            if pd.notna(bet_entry['read_score_patterns'])
-                            else None
-                        )
-                        read_players = (
-                            json.dumps(bet_entry['read_players'])
-                            if pd.notna(bet_entry['read_players'])
-                            else None
-                        )
+        # Calls almost always hold a single image, which doesn't need a groupby
+        image_names = cleaned_entries['image_source'].unique()
+        if len(image_names) == 1:
+            images = [(image_names[0], cleaned_entries)]
+        else:
+            images = cleaned_entries.groupby('image_source', sort=False)
 
-                        conn.execute("""
-                        INSERT OR IGNORE INTO raw_ocr_bets 
-                        (player_id, bet_type, score, date, bet_line, odds, 
-                        image_source, needs_review, raw_text, 
-                        read_score_patterns, read_players)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                        """, (
-                            player_id,
-                            bet_entry['bet_type'] if not pd.isna(bet_entry['bet_type']) else None,
-                            float(bet_entry['score']) if not pd.isna(bet_entry['score']) else None,
-                            bet_entry['date'] if not pd.isna(bet_entry['date']) else None,
-                            bet_entry['bet_line'] if not pd.isna(bet_entry['bet_line']) else None,
-                            int(bet_entry['odds']) if not pd.isna(bet_entry['odds']) else None,
-                            bet_entry['image_source'],
-                            needs_review,
-                            bet_entry['raw_text'],
-                            read_score_patterns,
-                            read_players
-                        ))
-                        conn.commit()
-                        
-                    except Exception as e:
-                        logger.error(f"Error saving bet to database: {str(e)}", exc_info=True)
-                        logger.debug(f"Problematic entry: {bet_entry}")
-                        conn.rollback()
-
-    def _init_ocr_reader(self) -> easyocr.Reader:
+        for image_name, image_df in images:
+            # Check needs_review on an image level as all bets in the image will have same flag 
+            needs_review, reasons = self._image_needs_review(image_df)
+            if needs_review:
+                logger.warning(
+                    f"Image needs review: {image_name}\n"
+                    f"Review reasons: {', '.join(reasons)}"
+                )
+
+            # Replace NA values with None so they are stored as NULL
+            image_df = image_df.astype(object).where(image_df.notna(), None)
+
+            rows = [(
+                self.player_ids.get(bet_entry.player) if bet_entry.player else None,
+                bet_entry.bet_type,
+                float(bet_entry.score) if bet_entry.score is not None else None,
+                bet_entry.date,
+                bet_entry.bet_line,
+                int(bet_entry.odds) if bet_entry.odds is not None else None,
+                bet_entry.image_source,
+                needs_review,
+                bet_entry.raw_text,
+                # Convert debug variables to JSON strings if they contain valid data
+                json.dumps(bet_entry.read_score_patterns) if bet_entry.read_score_patterns is not None else None,
+                json.dumps(bet_entry.read_players) if bet_entry.read_players is not None else None
+            ) for bet_entry in image_df.itertuples(index=False)]
+
+            # Insert all bets of the image in a single transaction, packing as many rows
+            # into each multi-row INSERT as SQLite's bound parameter limit allows
+            columns = len(rows[0])
+            max_rows = self.conn.getlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER) // columns
+            try:
+                self.conn.execute("BEGIN IMMEDIATE")
+                if replace_flagged:
+                    # Voided entries are kept, so INSERT OR IGNORE won't bring them back
+                    self.conn.execute("""
+                    DELETE FROM raw_ocr_bets
+                    WHERE image_source = ? AND needs_review = 1 AND is_voided = 0
+                    """, (image_name,))
+                for i in range(0, len(rows), max_rows):
+                    chunk = rows[i:i + max_rows]
+                    placeholders = ', '.join(['({})'.format(', '.join('?' * columns))] * len(chunk))
+                    self.conn.execute(f"""
+                    INSERT OR IGNORE INTO raw_ocr_bets 
+                    (player_id, bet_type, score, date, bet_line, odds, 
+                    image_source, needs_review, raw_text, 
+                    read_score_patterns, read_players)
+                    VALUES {placeholders}
+                    """, [value for row in chunk for value in row])
+                self.conn.execute("COMMIT")
+
+            except Exception as e:
+                if self.conn.in_transaction:
+                    self.conn.execute("ROLLBACK")
+                logger.error(f"Error saving bets from {image_name} to database: {str(e)}", exc_info=True)
+                logger.debug(f"Problematic entries: {rows}")
+
+    def _init_ocr_reader(self) -> 'easyocr.Reader':
         """Initialize OCR reader with GPU if available."""
+        import easyocr
+        import torch
 
         gpu = torch.cuda.is_available()
         if gpu:
             logger.info(f"GPU detected: {torch.cuda.get_device_name(0)}")
         else:
             logger.warning("No GPU detected, falling back to CPU")
+            # Split cores between the OCR worker threads instead of each one using all of them
+            torch.set_num_threads(max(1, (os.cpu_count() or 1) // OCR_CPU_WORKERS))
             
         return easyocr.Reader(['en', 'fr', 'de', 'tr', 'hr', 'rs_latin', 'lt', 'lv','pl'], gpu=gpu)
 
     def _get_ocr_text(self, file_path: str) -> Optional[str]:
         """Extract text from image using OCR."""
+        return dict(self._get_ocr_texts([file_path]))[file_path]
+
+    def _get_ocr_texts(self, file_paths: List[str]) -> Iterator[Tuple[str, Optional[str]]]:
+        """Extract text from images using batched OCR.
+
+        Images whose file contents are in ocr_cache are not OCR'd again. The rest are
+        split into chunks of OCR_IMAGE_BATCH_SIZE and OCR'd in a thread pool, so decoding
+        and OCR of one chunk overlap with the others (torch and OpenCV release the GIL).
+        Results are yielded to the calling thread as each chunk finishes, and the calling
+        thread is the only one writing to the database.
+
+        Yields:
+            (file_path, OCR text) pairs, OCR text is None for images where OCR failed
+        """
+        file_hashes = {file_path: self._hash_file(file_path) for file_path in file_paths}
+        cached_texts = self._get_cached_ocr_texts([h for h in file_hashes.values() if h])
+
+        file_paths_to_ocr = []
+        cached_count = 0
+        for file_path, file_hash in file_hashes.items():
+            if file_hash in cached_texts:
+                cached_count += 1
+                yield file_path, cached_texts[file_hash]
+            else:
+                file_paths_to_ocr.append(file_path)
+        if cached_count:
+            logger.info(f"Using cached OCR text for {cached_count} images")
+
+        chunks = [
+            file_paths_to_ocr[i:i + OCR_IMAGE_BATCH_SIZE]
+            for i in range(0, len(file_paths_to_ocr), OCR_IMAGE_BATCH_SIZE)
+        ]
+        if not chunks:
+            return
+
+        # The GPU runs one chunk at a time, so a second worker only overlaps decoding
+        max_workers = OCR_GPU_WORKERS if self.reader.device == 'cuda' else OCR_CPU_WORKERS
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(self._ocr_chunk, chunk) for chunk in chunks]
+            for future in as_completed(futures):
+                ocr_texts = future.result()
+                self._cache_ocr_texts([
+                    (file_hashes[file_path], raw_text)
+                    for file_path, raw_text in ocr_texts.items()
+                    if file_hashes[file_path] and raw_text is not None
+                ])
+                yield from ocr_texts.items()
+
+    def _ocr_chunk(self, file_paths: List[str]) -> Dict[str, Optional[str]]:
+        """Decode and OCR one chunk of images; runs in a worker thread and doesn't touch the database.
+
+        Returns:
+            Dict of {file_path: OCR text}, None for images where OCR failed
+        """
+        from easyocr.utils import reformat_input
+
+        texts = {}
+        decoded = []
+        for file_path in file_paths:
+            try:
+                decoded.append((file_path, *reformat_input(file_path)))
+            except Exception as e:
+                logger.error(f"OCR failed at {file_path}: {str(e)}")
+                texts[file_path] = None
+
+        texts.update(self._read_decoded_images(decoded))
+        return texts
+
+    def _read_decoded_images(self, decoded: List[Tuple[str, np.ndarray, np.ndarray]]) -> Dict[str, Optional[str]]:
+        """Run text detection and recognition over decoded images.
+
+        Same steps as reader.readtext, but detection runs once per group of equally sized
+        images (EasyOCR can only batch images of the same shape without resizing them),
+        and recognition runs under FP16 autocast on GPU.
+
+        Args:
+            decoded: List of (file_path, image, grayscale image) from easyocr's reformat_input
+
+        Returns:
+            Dict of {file_path: OCR text}, None for images where OCR failed
+        """
+        texts = {}
+        images_by_shape = defaultdict(list)
+        for file_path, img, img_cv_grey in decoded:
+            images_by_shape[img.shape].append((file_path, img, img_cv_grey))
+
+        for group in images_by_shape.values():
+            try:
+                horizontal_lists, free_lists = self.reader.detect(
+                    np.stack([img for _, img, _ in group]), reformat=False
+                )
+                for (file_path, _, img_cv_grey), horizontal_list, free_list in zip(group, horizontal_lists, free_lists):
+                    with self._recognizer_autocast():
+                        results = self.reader.recognize(
+                            img_cv_grey, horizontal_list, free_list,
+                            batch_size=OCR_RECOGNIZER_BATCH_SIZE, reformat=False
+                        )
+                    texts[file_path] = ' '.join([result[1] for result in results])
+            except Exception as e:
+                for file_path, _, _ in group:
+                    logger.error(f"OCR failed at {file_path}: {str(e)}")
+                    texts[file_path] = None
+
+        return texts
+
+    @staticmethod
+    def _hash_file(file_path: str) -> Optional[str]:
+        """Returns xxh3_64 hex digest of the file contents; None if the file can't be read."""
         try:
-            return ' '.join([result[1] for result in self.reader.readtext(file_path)])
-        except Exception as e:
-            logger.error(f"OCR failed at {file_path}: {str(e)}")
+            with open(file_path, 'rb') as f:
+                return xxhash.xxh3_64_hexdigest(f.read())
+        except OSError as e:
+            logger.error(f"Could not hash {file_path}: {str(e)}")
             return None
 
+    def _get_cached_ocr_texts(self, file_hashes: List[str]) -> Dict[str, str]:
+        """Returns {file_hash: raw_text} for the file_hashes found in ocr_cache."""
+        if not file_hashes:
+            return {}
+
+        # Look hashes up in chunks that fit SQLite's bound parameter limit
+        chunk_size = self.conn.getlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER)
+        cached_texts = {}
+        for i in range(0, len(file_hashes), chunk_size):
+            chunk = file_hashes[i:i + chunk_size]
+            query = "SELECT file_hash, raw_text FROM ocr_cache WHERE file_hash IN ({})".format(
+                ','.join('?' * len(chunk))
+            )
+            cached_texts.update(self.conn.execute(query, chunk).fetchall())
+        return cached_texts
+
+    def _cache_ocr_texts(self, rows: List[Tuple[str, str]]) -> None:
+        """Saves (file_hash, raw_text) rows to ocr_cache."""
+        if not rows:
+            return
+
+        self.conn.execute("BEGIN")
+        self.conn.executemany("""
+        INSERT OR REPLACE INTO ocr_cache (file_hash, raw_text)
+        VALUES (?, ?)
+        """, rows)
+        self.conn.execute("COMMIT")
+
+    def _recognizer_autocast(self) -> contextlib.AbstractContextManager:
+        """FP16 autocast for recognizer inference on GPU, no-op otherwise.
+
+        The detector stays in FP32 since easyocr hands its raw output to OpenCV, which
+        does not accept float16 arrays. On CPU easyocr already runs an int8-quantized recognizer.
+        """
+        if self.reader.device == 'cuda':
+            import torch
+            return torch.autocast(device_type='cuda', dtype=torch.float16)
+        return contextlib.nullcontext()
+
     def _cache_player_data(self) -> None:
         """Cache player data for efficient lookups.
         
@@ -438,107 +680,166 @@ class ImageProcessor:
         3. Identifies and adds any new players
         4. Updates player status (active/inactive) as needed
         """
-        with sqlite3.connect(DB_PATH) as conn:
-            # First load existing data
-            existing_players = dict(conn.execute(
-                "SELECT name, nba_api_id FROM players WHERE is_active = 1"
-            ).fetchall())
-            
-            # Get current active players from API
-            logger.info("Checking for new players from NBA API...")
-            active_players = players.get_active_players()                       
-            current_players = {p['full_name']: int(p['id']) for p in active_players} 
-            
-            # Find new players to add
-            new_players = {
-                name: player_id 
-                for name, player_id in current_players.items() 
-                if name not in existing_players
-            }
-            
-            # Find players who are no longer active
-            inactive_players = {
-                name: player_id 
-                for name, player_id in existing_players.items() 
-                if name not in current_players
-            }
-            
+        # First load existing data
+        existing_players = dict(self.conn.execute(
+            "SELECT name, nba_api_id FROM players WHERE is_active = 1"
+        ).fetchall())
+        
+        from nba_api.stats.static import players
+
+        # Get current active players from API
+        logger.info("Checking for new players from NBA API...")
+        active_players = players.get_active_players()                       
+        current_players = {p['full_name']: int(p['id']) for p in active_players} 
+        
+        # Find new players to add
+        new_players = {
+            name: player_id 
+            for name, player_id in current_players.items() 
+            if name not in existing_players
+        }
+        
+        # Find players who are no longer active
+        inactive_players = {
+            name: player_id 
+            for name, player_id in existing_players.items() 
+            if name not in current_players
+        }
+        
+        self.conn.execute("BEGIN")
+        try:
             if new_players:
                 # Add new players
                 for player_name, nba_api_id in new_players.items():
-                    conn.execute("""
+                    self.conn.execute("""
                     INSERT OR IGNORE INTO players (name, nba_api_id, is_active)
                     VALUES (?, ?, 1)
                     """, (player_name, nba_api_id))
                 logger.info(f"Added {len(new_players)} new players to database")
-            
+        
             if inactive_players:
                 # Mark inactive players
                 for player_name in inactive_players:
-                    conn.execute("""
+                    self.conn.execute("""
                     UPDATE players 
                     SET is_active = 0
                     WHERE name = ?
                     """, (player_name,))
                 logger.info(f"Marked {len(inactive_players)} players as inactive")
-            
+        
             # Cache final data in memory
             self.player_ids = current_players # dict of player name and id
             self.all_players = list(current_players.keys()) + list(NAME_REPLACEMENTS.keys()) # list of player names
+            self.name_automaton = self._build_automaton(self.all_players, NAME_REPLACEMENTS)
 
-            logger.info(f"Player cache updated. Total active players: {len(self.player_ids)}", exc_info=False)
-            conn.commit()
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
 
-    def _get_existing_data(self, conn: sqlite3.Connection, image_name: str) -> Optional[pd.DataFrame]:    
+        logger.info(f"Player cache updated. Total active players: {len(self.player_ids)}", exc_info=False)
+
+    def _get_existing_data(self, image_name: str) -> Optional[pd.DataFrame]:    
         """
         IF image is in raw_ocr_bets and doesn't need review: returns existing data for image
         ELSE deletes image from raw_ocr_bets and returns None
         """
 
-        query = """
-        SELECT * FROM raw_ocr_bets 
+        # Cheap existence check first so new images don't build an empty DataFrame
+        exists = self.conn.execute("""
+        SELECT 1 FROM raw_ocr_bets 
         WHERE image_source = ? AND needs_review = 0
-        """
-        df = pd.read_sql_query(query, conn, params=(image_name,))
+        LIMIT 1
+        """, (image_name,)).fetchone()
         
-        if not df.empty:
+        if exists:
             logger.info(f"Using existing data for {image_name}")
-            return df
+            query = """
+            SELECT * FROM raw_ocr_bets 
+            WHERE image_source = ? AND needs_review = 0
+            """
+            return pd.read_sql_query(query, self.conn, params=(image_name,))
             
-        conn.execute("DELETE FROM raw_ocr_bets WHERE image_source = ?", (image_name,))
-        conn.commit()
+        self.conn.execute("DELETE FROM raw_ocr_bets WHERE image_source = ?", (image_name,))
         return None
 
-    def _find_bet_type(self, raw_text: str) -> Optional[str]:
-        """Returns first ORDERED_OCR_BET_TYPE to appear in raw_text; None if no match.
+    def _get_reviewed_image_counts(self) -> Dict[str, int]:
+        """Returns {image_source: bet count} for images in raw_ocr_bets that don't need review."""
+        query = """
+        SELECT image_source, COUNT(*) FROM raw_ocr_bets
+        WHERE needs_review = 0
+        GROUP BY image_source
+        """
+        return dict(self.conn.execute(query).fetchall())
+
+    def _delete_image_data(self, image_names: List[str], chunk_size: int = 500) -> None:
+        """Deletes all raw_ocr_bets rows for image_names in one transaction."""
+        if not image_names:
+            return
 
-        @TODO: Could be more efficient? We call this for each image, and search through raw text for each bet type
+        self.conn.execute("BEGIN")
+        try:
+            for i in range(0, len(image_names), chunk_size):
+                chunk = image_names[i:i + chunk_size]
+                self.conn.execute(
+                    "DELETE FROM raw_ocr_bets WHERE image_source IN ({})".format(','.join('?' * len(chunk))),
+                    chunk
+                )
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+
+    def _find_bet_type(self, raw_text_lower: str) -> Optional[str]:
+        """Returns standardized type of the first ORDERED_OCR_BET_TYPE to appear in raw_text_lower; None if no match.
+
+        Scans raw_text_lower once with bet_type_automaton; when several bet types match
+        (e.g. "Pts+Reb" inside "Pts+Reb+Ast") the earliest in ORDERED_OCR_BET_TYPES wins.
 
         Normalizes spaces around '+' to handle variations like:
         - "Pts + Reb + Ast"
         - "Pts+Reb+Ast"
         - "Pts+ Reb +Ast"
         """
-        raw_text = raw_text.lower()
-        raw_text = re.sub(r'\s*\+\s*', '+', raw_text)
+        raw_text_lower = _PLUS_SPACING_RE.sub('+', raw_text_lower)
         
-        for search_string in ORDERED_OCR_BET_TYPES:
-            if search_string.lower() in raw_text:
-                return search_string
+        matches = [(order, bet_type) for _, (order, bet_type, _) in self.bet_type_automaton.iter(raw_text_lower)]
+        if not matches:
+            return None
 
-        return None
+        return min(matches)[1]
+
+    def _find_players_in_text(self, raw_text_lower: str) -> List[str]:
+        """Returns all_players ordered by first appearance in raw_text_lower, with NAME_REPLACEMENTS applied
+
+        Scans raw_text_lower once with name_automaton,
+        recording each player's start index as it is matched. Players appearing at the
+        same position keep their order in all_players.
+        """
+        # {order in all_players: (start index of first match, order, name)}
+        first_matches = {}
+        for end_idx, (order, name, length) in self.name_automaton.iter(raw_text_lower):
+            if order not in first_matches:
+                first_matches[order] = (end_idx - length + 1, order, name)
+
+        return [name for _, _, name in sorted(first_matches.values())]
+
+    @staticmethod
+    def _build_automaton(words: List[str], replacements: Dict[str, str]) -> ahocorasick.Automaton:
+        """Build an Aho-Corasick automaton over lowercased words.
 
-    def _find_players_in_text(self, raw_text: str) -> List[str]:
-        """Returns all_players ordered by appearance in raw_text
-        @TODO: Could be more efficient. 
-               We're currently iterating over all players and checking if they're in the raw_text for each image
+        Each key maps to (index in words, standardized word, key length), so matches come back
+        already standardized with replacements. Duplicate keys keep their first index.
         """
-        raw_text = raw_text.lower()
-        return sorted(
-            [s for s in self.all_players if s.lower() in raw_text],
-            key=lambda x: raw_text.index(x.lower())
-        )
+        automaton = ahocorasick.Automaton()
+        for order, word in enumerate(words):
+            key = word.lower()
+            if not automaton.exists(key):
+                automaton.add_word(key, (order, replacements.get(word, word), len(key)))
+        automaton.make_automaton()
+        return automaton
 
 if __name__ == "__main__":
     processor = ImageProcessor()
     processor.process_folder(IMAGES_DIR / '2025', 2025)
+    processor.close()
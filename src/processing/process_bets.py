@@ -9,26 +9,209 @@ Workflow:
 4. Marks bets as processed or flags unplayed games
 """
 
+import re
 import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future
 from datetime import datetime
 from pathlib import Path
-from time import sleep
+from time import sleep, monotonic
 from random import uniform
-from typing import Dict, Any, Optional, Tuple, List
+from typing import Dict, Any, Optional, Tuple, List, NamedTuple
 
-import pandas as pd
 import numpy as np
 
+import requests_cache
 from requests.exceptions import RequestException
 from requests.exceptions import Timeout
 from nba_api.stats.endpoints import playergamelog
+from nba_api.stats.library.http import NBAStatsHTTP
 
+from src.database.init_db import init_database, connect_db
 from src.utils.logger import setup_logger
-from src.utils.config import DB_PATH
-from src.utils.constants import SEASON
+from src.utils.config import DB_PATH, NBA_API_CACHE_PATH
+from src.utils.constants import (
+    SEASON,
+    NBA_API_CACHE_EXPIRE_SECONDS,
+    NBA_API_MAX_RETRIES,
+    NBA_API_HEADERS,
+    NBA_API_TIMEOUT,
+    NBA_API_WORKERS,
+    NBA_API_REQUESTS_PER_SECOND,
+    VALIDATION_WORKERS
+)
 
 logger = setup_logger(__name__)
 
+# Score range categories: scores in [SCORE_RANGE_EDGES[i], SCORE_RANGE_EDGES[i + 1]) get SCORE_RANGE_LABELS[i]
+SCORE_RANGE_EDGES = np.array([20, 25, 30, 35, 40, 45, 50])
+SCORE_RANGE_LABELS = np.array(["20-25", "25-30", "30-35", "35-40", "40-45", "45-50", "50+"])
+
+# Valid bet line format: 'o' or 'u' followed by a number ending in .5
+_BET_LINE_MATCH = re.compile(r'^[ou]\d+\.5$').match
+
+
+def _bet_line_ok(bet_line: Optional[str]) -> int:
+    """SQLite function bet_line_ok(bet_line): 1 if the bet line has a valid format, else 0."""
+    return 1 if bet_line and _BET_LINE_MATCH(bet_line) else 0
+
+
+# Data integrity checks run by validate_full: (message logged if the query returns rows, query)
+VALIDATION_QUERIES = [
+    # 1. raw_ocr_bets player id is not in players table
+    ("Invalid player IDs found", """
+    SELECT r.id, r.player_id 
+    FROM raw_ocr_bets r 
+    LEFT JOIN players p ON r.player_id = p.nba_api_id 
+    WHERE r.is_voided = 0 AND r.needs_review = 0 AND p.nba_api_id IS NULL
+    """),
+
+    # 2. game_stats contains duplicate player_id and date combinations
+    ("Duplicate game stats found", """
+    SELECT player_id, date, COUNT(*) 
+    FROM game_stats 
+    GROUP BY player_id, date 
+    HAVING COUNT(*) > 1
+    """),
+
+    # 3. raw_ocr_bets is_processed = 1 but not in results
+    ("Processed bets missing results", """
+    SELECT id FROM raw_ocr_bets 
+    WHERE is_processed = 1 
+    AND id NOT IN (
+        SELECT raw_bet_id FROM bet_results 
+        UNION 
+        SELECT raw_bet_id FROM unplayed_bets
+    )
+    """),
+
+    # 4. Invalid bet line format (must start with 'o' or 'u' followed by number and .5)
+    ("Invalid bet line formats", """
+    SELECT id, bet_line 
+    FROM raw_ocr_bets 
+    WHERE NOT bet_line_ok(bet_line)
+    AND is_voided = 0 AND needs_review = 0
+    """),
+
+    # 5. Future dates (CHECK constraints can't use date('now'))
+    ("Future dates found", """
+    SELECT id, date 
+    FROM raw_ocr_bets 
+    WHERE date > date('now')
+    AND is_voided = 0 AND needs_review = 0
+    """),
+
+    # 6. Duplicate bets for same player/date/type (not necessarily same bet)
+    ("Potential duplicate bets found", """
+    SELECT player_id, date, bet_type, COUNT(*) as count
+    FROM raw_ocr_bets
+    WHERE is_voided = 0 AND needs_review = 0
+    GROUP BY player_id, date, bet_type
+    HAVING COUNT(*) > 1
+    """),
+
+    # 7. Missing required fields
+    ("Missing required fields", """
+    SELECT id,
+        CASE 
+            WHEN player_id IS NULL THEN 'player_id'
+            WHEN bet_type IS NULL THEN 'bet_type'
+            WHEN score IS NULL THEN 'score'
+            WHEN date IS NULL THEN 'date'
+            WHEN bet_line IS NULL THEN 'bet_line'
+            WHEN odds IS NULL THEN 'odds'
+        END as missing_field
+    FROM raw_ocr_bets
+    WHERE (player_id IS NULL OR bet_type IS NULL OR score IS NULL 
+          OR date IS NULL OR bet_line IS NULL OR odds IS NULL)
+    AND is_voided = 0 AND needs_review = 0
+    """)
+]
+
+# Checks from VALIDATION_QUERIES (3) that new writes can break, rerun by validate_post only for
+# the bets processed in this run. {placeholders} is filled with one ? per bet id.
+# Orphaned rows are rejected by foreign keys, enforced on every connect_db connection.
+POST_VALIDATION_QUERIES = [
+    ("Processed bets missing results", """
+    SELECT id FROM raw_ocr_bets 
+    WHERE is_processed = 1 
+    AND id IN ({placeholders})
+    AND id NOT IN (
+        SELECT raw_bet_id FROM bet_results 
+        UNION 
+        SELECT raw_bet_id FROM unplayed_bets
+    )
+    """),
+]
+
+# Statements executed once per queued row by BetProcessor._flush_pending. Kept as constants so every
+# call passes the same SQL string and reuses the connection's prepared statement.
+UPSERT_GAME_STATS_SQL = """
+INSERT INTO game_stats (
+    player_id, date, points, assists, rebounds, blocks, steals, turnovers, three_pointers, par, pts_rebs, pts_asts, rebs_asts
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(player_id, date) DO UPDATE SET
+    points = excluded.points,
+    assists = excluded.assists,
+    rebounds = excluded.rebounds,
+    blocks = excluded.blocks,
+    steals = excluded.steals,
+    turnovers = excluded.turnovers,
+    three_pointers = excluded.three_pointers,
+    par = excluded.par,
+    pts_rebs = excluded.pts_rebs,
+    pts_asts = excluded.pts_asts,
+    rebs_asts = excluded.rebs_asts
+RETURNING id
+"""
+
+INSERT_BET_RESULT_SQL = """
+INSERT INTO bet_results (
+    raw_bet_id, player_id, game_stats_id, bet_type,
+    result, result_delta, score_range, over_under, stat_result, line_value, date
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+INSERT_UNPLAYED_BET_SQL = """
+INSERT OR IGNORE INTO unplayed_bets (raw_bet_id, player_id, date)
+VALUES (?, ?, ?)
+"""
+
+MARK_BET_PROCESSED_SQL = """
+UPDATE raw_ocr_bets 
+SET is_processed = 1
+WHERE id = ?
+"""
+
+
+class RateLimiter:
+    """Space calls to wait() at least 1 / rate seconds apart across all threads."""
+
+    def __init__(self, rate: float) -> None:
+        self.interval = 1 / rate
+        self._next_time = monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        """Block until the caller's slot, reserving the next slot for the following caller."""
+        with self._lock:
+            now = monotonic()
+            delay = self._next_time - now
+            self._next_time = max(now, self._next_time) + self.interval
+        if delay > 0:
+            sleep(delay)
+
+
+class Bet(NamedTuple):
+    """Unprocessed bet row from raw_ocr_bets."""
+    id: int
+    player_id: int
+    bet_type: str
+    score: float
+    date: str
+    bet_line: str
+    odds: int
+
 class BetProcessor:
     """Processes betting data using NBA statistics and updates database.
     
@@ -45,7 +228,40 @@ class BetProcessor:
     def __init__(self) -> None:
         """Initialize the bet processor."""
         self.db_file = DB_PATH
-        self.conn = sqlite3.connect(self.db_file)
+        init_database()  # Ensures tables and indexes exist
+        self.conn = connect_db()
+        # {player_id: {YYYY-MM-DD game date: standardized stats}}, so each player is fetched once per run
+        self.game_logs: Dict[int, Dict[str, Dict[str, float]]] = {}
+        # (player_id, date) lookups loaded once per run by _load_cached_data
+        self.cached_stats: Dict[Tuple[int, str], Dict[str, float]] = {}
+        self.game_stats_ids: Dict[Tuple[int, str], int] = {}
+        self.unplayed: set = set()
+        # Rows queued during the bet loop and written in one transaction by _flush_pending
+        self.pending: Dict[str, list] = {}
+        # Game log fetches started by _prefetch_game_logs, consumed by _get_player_game_log
+        self.game_log_futures: Dict[int, Future] = {}
+        # Shared by all API fetch threads
+        self.rate_limiter = RateLimiter(NBA_API_REQUESTS_PER_SECOND)
+        self.api_session = self._install_api_cache()
+
+    @staticmethod
+    def _install_api_cache() -> requests_cache.CachedSession:
+        """Route nba_api stats requests through a persistent SQLite HTTP cache.
+
+        Responses are keyed on URL and params, so reruns within NBA_API_CACHE_EXPIRE_SECONDS
+        don't hit stats.nba.com again. Failed responses are not cached.
+
+        Returns:
+            The installed session, shared by all API fetch threads
+        """
+        session = requests_cache.CachedSession(
+            NBA_API_CACHE_PATH,
+            backend='sqlite',
+            expire_after=NBA_API_CACHE_EXPIRE_SECONDS,
+            allowable_codes=(200,)
+        )
+        NBAStatsHTTP.set_session(session)
+        return session
 
     def process_new_bets(self) -> bool:
         """Process all unprocessed bets in database.
@@ -59,7 +275,7 @@ class BetProcessor:
                 - players: player_id for NBA API and player_name for display
             Writes to:
                 - game_stats with NBA API data for player_id and game_date: points, assists, rebounds, three_pointers, blocks, steals, turnovers, par, pts_rebs, pts_asts, rebs_asts 
-                - bet_results with relevant results for a bet: raw_bet_id, player_id, game_stats_id, bet_type, result, result_delta, score_range, over_under, stat_result, line_value
+                - bet_results with relevant results for a bet: raw_bet_id, player_id, game_stats_id, bet_type, result, result_delta, score_range, over_under, stat_result, line_value, date
                 - unplayed_bets with raw_ocr_bets IDs for which no stats were found
             Updates:
                 - raw_ocr_bets.is_processed to 1 if NBA API call was successful for player_id and game_date
@@ -71,13 +287,13 @@ class BetProcessor:
         
         try:
             # Validate before processing
-            self.validate_data_integrity()
+            self.validate_full()
             
-            self._process_unprocessed_bets()
+            processed_ids = self._process_unprocessed_bets()
             self.conn.commit()
             
-            # Validate after processing
-            self.validate_data_integrity()
+            # Validate only what this run wrote; everything else was just checked
+            self.validate_post(processed_ids)
             
             logger.info("Successfully processed all new bets")
             return True
@@ -87,7 +303,7 @@ class BetProcessor:
             logger.error(f"Transaction rolled back. Error processing bets: {str(e)}", exc_info=True)
             return False
 
-    def validate_data_integrity(self) -> None:
+    def validate_full(self) -> None:
         """Validate database integrity, logging any issues found:
 
         @TODO: Remove redundant checks and consider additional checks.
@@ -97,157 +313,128 @@ class BetProcessor:
         - Game stats contains duplicate player_id and date combinations
         - Raw bets marked as processed are not in bet_results or unplayed_bets
         - Bet lines have valid over/under format
-        - Scores are within valid ranges
         - Dates are not in the future
-        - Odds are within valid ranges
-        - No orphaned records in bet_results or game_stats
         - No duplicate bets for same player/date/type
         - All required bet fields are non-null
+
+        Score and odds ranges and orphaned records are enforced by the schema (see init_db.py).
         
         Database:
             - Reads from raw_ocr_bets, players, game_stats, bet_results, unplayed_bets
         """
-        queries = [
-            # 1. raw_ocr_bets player id is not in players table
-            """
-            SELECT r.id, r.player_id 
-            FROM raw_ocr_bets r 
-            LEFT JOIN players p ON r.player_id = p.nba_api_id 
-            WHERE r.is_voided = 0 AND r.needs_review = 0 AND p.nba_api_id IS NULL
-            """,
-
-            # 2. game_stats contains duplicate player_id and date combinations
-            """
-            SELECT player_id, date, COUNT(*) 
-            FROM game_stats 
-            GROUP BY player_id, date 
-            HAVING COUNT(*) > 1
-            """,
-
-            # 3. raw_ocr_bets is_processed = 1 but not in results
-            """
-            SELECT id FROM raw_ocr_bets 
-            WHERE is_processed = 1 
-            AND id NOT IN (
-                SELECT raw_bet_id FROM bet_results 
-                UNION 
-                SELECT raw_bet_id FROM unplayed_bets
-            )
-            """,
-
-            # 4. Invalid bet line format (must start with 'o' or 'u' followed by number and .5)
-            """
-            SELECT id, bet_line 
-            FROM raw_ocr_bets 
-            WHERE (bet_line NOT LIKE 'o%.5' AND bet_line NOT LIKE 'u%.5')
-            AND is_voided = 0 AND needs_review = 0
-            """,
-
-            # 5. Scores outside valid range (20-100)
-            """
-            SELECT id, score 
-            FROM raw_ocr_bets 
-            WHERE (score < 20 OR score > 100)
-            AND is_voided = 0 AND needs_review = 0
-            """,
-
-            # 6. Future dates
-            """
-            SELECT id, date 
-            FROM raw_ocr_bets 
-            WHERE date > date('now')
-            AND is_voided = 0 AND needs_review = 0
-            """,
-
-            # 7. Invalid odds ranges (-1000 to +1000)
-            """
-            SELECT id, odds 
-            FROM raw_ocr_bets 
-            WHERE (odds < -1000 OR odds > 1000)
-            AND is_voided = 0 AND needs_review = 0
-            """,
-
-            # 8. Orphaned records in bet_results
-            """
-            SELECT br.id, br.raw_bet_id
-            FROM bet_results br
-            LEFT JOIN raw_ocr_bets r ON br.raw_bet_id = r.id
-            WHERE r.id IS NULL
-            """,
-
-            # 9. Orphaned records in game_stats
-            """
-            SELECT gs.id, gs.player_id
-            FROM game_stats gs
-            LEFT JOIN players p ON gs.player_id = p.nba_api_id
-            WHERE p.nba_api_id IS NULL
-            """,
-
-            # 10. Duplicate bets for same player/date/type (not necessarily same bet)
-            """
-            SELECT player_id, date, bet_type, COUNT(*) as count
-            FROM raw_ocr_bets
-            WHERE is_voided = 0 AND needs_review = 0
-            GROUP BY player_id, date, bet_type
-            HAVING COUNT(*) > 1
-            """,
-
-            # 11. Missing required fields
-            """
-            SELECT id,
-                CASE 
-                    WHEN player_id IS NULL THEN 'player_id'
-                    WHEN bet_type IS NULL THEN 'bet_type'
-                    WHEN score IS NULL THEN 'score'
-                    WHEN date IS NULL THEN 'date'
-                    WHEN bet_line IS NULL THEN 'bet_line'
-                    WHEN odds IS NULL THEN 'odds'
-                END as missing_field
-            FROM raw_ocr_bets
-            WHERE (player_id IS NULL OR bet_type IS NULL OR score IS NULL 
-                  OR date IS NULL OR bet_line IS NULL OR odds IS NULL)
-            AND is_voided = 0 AND needs_review = 0
-            """
-        ]
-        
-        validation_messages = {
-            0: "Invalid player IDs found",
-            1: "uplicate game stats found",
-            2: "Processed bets missing results",
-            3: "Invalid bet line formats",
-            4: "Scores outside valid range",
-            5: "Future dates found",
-            6: "Invalid odds ranges",
-            7: "Orphaned bet results",
-            8: "Orphaned game stats",
-            9: "Potential duplicate bets found",
-            10: "Missing required fields"
-        }
-        
-        for i, query in enumerate(queries):
+        # Each query runs on its own read-only connection; WAL readers don't block each other
+        with ThreadPoolExecutor(max_workers=VALIDATION_WORKERS) as executor:
+            results = executor.map(self._run_validation_query, VALIDATION_QUERIES)
+            for (message, _), (query_results, error) in zip(VALIDATION_QUERIES, results):
+                if error:
+                    logger.error(f"Error running validation query for '{message}': {error}")
+                elif query_results:
+                    logger.warning(f"Data integrity issue - {message}: {query_results}")
+
+    def validate_post(self, bet_ids: List[int]) -> None:
+        """Rerun the checks new writes can break, limited to the given processed bets.
+
+        Args:
+            bet_ids: raw_ocr_bets ids marked as processed in this run
+        """
+        if not bet_ids:
+            return
+
+        # Stay under SQLite's bound parameter limit
+        chunk_size = self.conn.getlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER)
+        for message, query in POST_VALIDATION_QUERIES:
+            query_results = []
             try:
-                results = self.conn.execute(query).fetchall()
-                if results:
-                    logger.warning(f"Data integrity issue - {validation_messages[i]}: {results}")
+                for start in range(0, len(bet_ids), chunk_size):
+                    chunk = bet_ids[start:start + chunk_size]
+                    chunk_query = query.format(placeholders=','.join('?' * len(chunk)))
+                    query_results.extend(self.conn.execute(chunk_query, chunk).fetchall())
             except Exception as e:
-                logger.error(f"Error running validation query {i}: {str(e)}")
+                logger.error(f"Error running validation query for '{message}': {str(e)}")
+                continue
+            if query_results:
+                logger.warning(f"Data integrity issue - {message}: {query_results}")
 
-    def _process_unprocessed_bets(self) -> None:
+    def _run_validation_query(self, validation_query: Tuple[str, str]) -> Tuple[List[tuple], Optional[str]]:
+        """Run one validation query on a new read-only connection.
+
+        Returns:
+            Tuple of (result rows, error message or None)
+        """
+        _, query = validation_query
+        try:
+            conn = sqlite3.connect(f"{Path(self.db_file).as_uri()}?mode=ro", uri=True)
+            try:
+                conn.execute("PRAGMA query_only=1")
+                conn.create_function('bet_line_ok', 1, _bet_line_ok, deterministic=True)
+                return conn.execute(query).fetchall(), None
+            finally:
+                conn.close()
+        except Exception as e:
+            return [], str(e)
+
+    def _process_unprocessed_bets(self) -> List[int]:
         """Process bets that haven't been processed yet.
         
         - Reads raw_ocr_bets where is_processed = 0, is_voided = 0, and needs_review = 0
         - Checks for cached data in game_stats and unplayed_bets tables
         - If no cached data, fetches from NBA API and updates game_stats or unplayed_bets tables
         - Marks bet as processed in raw_ocr_bets table
+
+        Returns:
+            IDs of the bets marked as processed
         """
 
         # Get unprocessed bets from raw_ocr_bets table
         unprocessed_ocr_bets = self._get_unprocessed_bets()
-        if unprocessed_ocr_bets.empty:
+        if not unprocessed_ocr_bets:
             logger.info("No unprocessed bets found")
-            return
-        
-        for _, ocr_bet in unprocessed_ocr_bets.iterrows():
+            return []
+
+        # Load game_stats and unplayed_bets once instead of querying them per bet
+        self._load_cached_data()
+        self.pending = {'game_stats': [], 'bet_results': [], 'unplayed_bets': [], 'processed_ids': []}
+        # (bet, game stats) pairs whose results are calculated together after the loop
+        scored_bets = []
+
+        with ThreadPoolExecutor(max_workers=NBA_API_WORKERS) as executor:
+            # Fetch game logs in the background while the loop works through bets that are already resolved
+            self._prefetch_game_logs(executor, unprocessed_ocr_bets)
+            try:
+                self._score_bets(unprocessed_ocr_bets, scored_bets)
+            finally:
+                # Don't wait on fetches that will never be used if the loop stopped early
+                for future in self.game_log_futures.values():
+                    future.cancel()
+                self.game_log_futures = {}
+
+        self.insert_into_bet_results(scored_bets)
+        self._flush_pending()
+        return self.pending['processed_ids']
+
+    def _prefetch_game_logs(self, executor: ThreadPoolExecutor, ocr_bets: List[Bet]) -> None:
+        """Start fetching the game log of each player whose bets aren't resolved from the database.
+
+        Players are submitted in bet order, so the logs the loop needs first are fetched first.
+        Bets without a player_id are skipped here and fail on their own in _score_bets.
+        """
+        for ocr_bet in ocr_bets:
+            if ocr_bet.player_id is None:
+                continue
+            key = self._stats_key(ocr_bet)
+            player_id = key[0]
+            if key in self.cached_stats or key in self.unplayed:
+                continue
+            if player_id in self.game_logs or player_id in self.game_log_futures:
+                continue
+            self.game_log_futures[player_id] = executor.submit(self._fetch_player_game_log, player_id)
+
+    def _score_bets(self, unprocessed_ocr_bets: List[Bet], scored_bets: List[Tuple[Bet, Dict[str, float]]]) -> None:
+        """Resolve each bet to game stats or unplayed, queueing its rows.
+
+        Bets with game stats are appended to scored_bets for insert_into_bet_results.
+        """
+        for ocr_bet in unprocessed_ocr_bets:
             try:
                 # Get player's game stats from game_stats, unplayed_bets, or NBA API.
                 # Set in_db True if player's game stats came from DB and not API
@@ -256,146 +443,248 @@ class BetProcessor:
                 # If stats don't exist
                 if game_stats is None:
                     # Insert bet into unplayed_bets
-                    logger.info(f"Inserting into *unplayed_bets* for bet {ocr_bet['id']}, player_id: {ocr_bet['player_id']}, date: {ocr_bet['date']}")
+                    logger.info(f"Inserting into *unplayed_bets* for bet {ocr_bet.id}, player_id: {ocr_bet.player_id}, date: {ocr_bet.date}")
                     self.insert_into_unplayed_bets(ocr_bet)
 
                     # Mark bet as processed
-                    logger.info(f"Marking bet {ocr_bet['id']} as processed")
+                    logger.info(f"Marking bet {ocr_bet.id} as processed")
                     self._mark_bet_processed(ocr_bet)
                 
                 #If stats exist
                 else: 
                     # Insert bet into game_stats if it isn't already in DB
                     if not in_db:
-                        logger.info(f"Inserting into *game_stats* for bet {ocr_bet['id']}, player_id: {ocr_bet['player_id']}, date: {ocr_bet['date']}")
+                        logger.info(f"Inserting into *game_stats* for bet {ocr_bet.id}, player_id: {ocr_bet.player_id}, date: {ocr_bet.date}")
                         self.insert_into_game_stats(ocr_bet, game_stats)
 
-                    # Insert bet into bet_results and mark bet as processed
-                    logger.info(f"Inserting into *bet_results* for bet {ocr_bet['id']}, player_id: {ocr_bet['player_id']}, date: {ocr_bet['date']}")
-                    self.insert_into_bet_results(ocr_bet, game_stats)
+                    # Insert bet into bet_results and mark bet as processed once all results are calculated
+                    scored_bets.append((ocr_bet, game_stats))
 
-                    # Mark bet as processed
-                    logger.info(f"Marking bet {ocr_bet['id']} as processed")
-                    self._mark_bet_processed(ocr_bet)
+            except RequestException:
+                # API is still failing after retries: keep the results so far and stop processing
+                self.insert_into_bet_results(scored_bets)
+                self._flush_pending()
+                raise
 
             except Exception as e:
-                logger.error(f"Error processing bet {ocr_bet['id']}: {str(e)}")
+                logger.error(f"Error processing bet {ocr_bet.id}: {str(e)}")
                 continue
 
-    def insert_into_bet_results(self, ocr_bet: pd.Series, game_stats: Dict[str, Any]) -> None:
-        """Insert results of bet and corresponding game_stats into bet_results table."""
-        try:
-            result, result_delta, stat_result, line_value, over_under = self._calculate_results(ocr_bet, game_stats)
-            score_range = self._calculate_score_range(ocr_bet['score'])
-            game_stats_id = self._get_game_stats_id(ocr_bet)
-            
-            with self.conn:
-                self.conn.execute("""
-                INSERT INTO bet_results (
-                    raw_bet_id, player_id, game_stats_id, bet_type,
-                    result, result_delta, score_range, over_under, stat_result, line_value
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    ocr_bet['id'], ocr_bet['player_id'], game_stats_id, ocr_bet['bet_type'],
-                    result, result_delta, score_range, over_under, stat_result, line_value
-                ))
-                
-        except Exception as e:
-            logger.error(f"Error processing bet result for ocr bet {ocr_bet['id']}: {str(e)}", exc_info=True)
-            raise
+    def _flush_pending(self) -> None:
+        """Write all queued rows with executemany in a single transaction.
 
-    def insert_into_game_stats(self, ocr_bet: pd.Series, game_stats: Dict[str, Any]) -> None:
-        """Insert game stats into game_stats table"""
-
-        try: 
-            with self.conn: 
-                self.conn.execute("""
-                INSERT INTO game_stats (
-                    player_id, date, points, assists, rebounds, blocks, steals, turnovers, three_pointers, par, pts_rebs, pts_asts, rebs_asts
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    ocr_bet['player_id'], 
-                    ocr_bet['date'], 
-                    game_stats['points'],
-                    game_stats['assists'],
-                    game_stats['rebounds'],
-                    game_stats['blocks'],
-                    game_stats['steals'],
-                    game_stats['turnovers'],
-                    game_stats['three_pointers'],
-                    game_stats['par'],
-                    game_stats['pts_rebs'],
-                    game_stats['pts_asts'],
-                    game_stats['rebs_asts']
-                ))
-        except Exception as e:
-            logger.error(f"Error inserting game stats for {ocr_bet['player_id']} on {ocr_bet['date']}: {str(e)}")
-            raise
+        game_stats rows are upserted first so their ids can be filled in for the
+        bet_results rows that reference them.
+        """
+        pending = self.pending
+        with self.conn:
+            # Take the write lock up front rather than upgrading from a read lock mid-transaction
+            self.conn.execute("BEGIN IMMEDIATE")
+            # Upsert each game_stats row and take its id from RETURNING, so no separate id lookup is needed
+            # (UNIQUE(player_id, date) is the conflict target)
+            for row in pending['game_stats']:
+                game_stats_id = self.conn.execute(UPSERT_GAME_STATS_SQL, row).fetchone()[0]
+                self.game_stats_ids[(row[0], row[1])] = game_stats_id
+
+            # key is (player_id, date), so it also supplies the bet date
+            self.conn.executemany(INSERT_BET_RESULT_SQL, [
+                (raw_bet_id, player_id, self.game_stats_ids[key], *results, key[1])
+                for key, raw_bet_id, player_id, *results in pending['bet_results']
+            ])
+
+            self.conn.executemany(INSERT_UNPLAYED_BET_SQL, pending['unplayed_bets'])
+
+            self.conn.executemany(MARK_BET_PROCESSED_SQL, [(bet_id,) for bet_id in pending['processed_ids']])
+
+        # Refresh planner statistics after the bulk insert; only analyzes tables that need it
+        self.conn.execute("PRAGMA optimize")
+
+        logger.info(
+            f"Wrote {len(pending['game_stats'])} game stats, {len(pending['bet_results'])} bet results, "
+            f"{len(pending['unplayed_bets'])} unplayed bets, and marked {len(pending['processed_ids'])} bets as processed"
+        )
+
+    def insert_into_bet_results(self, scored_bets: List[Tuple[Bet, Dict[str, Any]]]) -> None:
+        """Queue results of bets and corresponding game_stats for insertion into bet_results table,
+        and mark those bets as processed.
+
+        Bets whose result can't be calculated are logged and left unprocessed.
+        """
+        valid_bets, stat_values, line_values, is_over, odds, scores = [], [], [], [], [], []
+        for ocr_bet, game_stats in scored_bets:
+            try:
+                # Value of stat being bet. (e.g. if bet_type = 'points' and points = 21, stat_value = 21) 
+                stat_value = float(game_stats[ocr_bet.bet_type])
+                # A stat the API returned as null is NaN, which compares False both ways and would score as a loss
+                if np.isnan(stat_value):
+                    raise ValueError(f"No {ocr_bet.bet_type} stat recorded for this game")
+
+                # Value of line being bet. (e.g. if bet_line = 'o21.5', line_value = 21.5)
+                line_value = float(ocr_bet.bet_line[1:])
+
+                # @TODO: Check if redundant; we already validated this? 
+                if ocr_bet.bet_line[0] not in ('o', 'u'):
+                    raise ValueError(f"Invalid bet line format: {ocr_bet.bet_line}. Must start with 'o' or 'u'")
+
+                score = float(ocr_bet.score)
+                if score < SCORE_RANGE_EDGES[0]:
+                    # @TODO: Check if redundant; we already validated this? 
+                    raise ValueError("Score is less than 20")
+                bet_odds = float(ocr_bet.odds)
+            except Exception as e:
+                logger.error(f"Error processing bet result for ocr bet {ocr_bet.id}: {str(e)}", exc_info=True)
+                continue
+
+            valid_bets.append(ocr_bet)
+            stat_values.append(stat_value)
+            line_values.append(line_value)
+            is_over.append(ocr_bet.bet_line[0] == 'o')
+            odds.append(bet_odds)
+            scores.append(score)
+
+        if not valid_bets:
+            return
+
+        stat_values = np.array(stat_values)
+        line_values = np.array(line_values)
+        is_over = np.array(is_over)
+        results, result_deltas, is_push = self._calculate_results(stat_values, line_values, is_over, np.array(odds))
+        over_unders = np.where(is_over, "Over", "Under")
+        score_ranges = self._calculate_score_ranges(np.array(scores))
+
+        for i, ocr_bet in enumerate(valid_bets):
+            # Design decision: all bet lines have been .5, so 'push' result more likely to be an OCR error than a true push 
+            if is_push[i]:
+                logger.error(f"Error processing bet result for ocr bet {ocr_bet.id}: Bet resulted in a push")
+                continue
+
+            logger.info(f"Inserting into *bet_results* for bet {ocr_bet.id}, player_id: {ocr_bet.player_id}, date: {ocr_bet.date}")
+            # game_stats_id is looked up by (player_id, date) when flushing, as the game_stats row may be queued too
+            self.pending['bet_results'].append((
+                self._stats_key(ocr_bet), int(ocr_bet.id), int(ocr_bet.player_id), ocr_bet.bet_type,
+                str(results[i]), float(result_deltas[i]), str(score_ranges[i]), str(over_unders[i]),
+                float(stat_values[i]), float(line_values[i])
+            ))
+
+            # Mark bet as processed
+            logger.info(f"Marking bet {ocr_bet.id} as processed")
+            self._mark_bet_processed(ocr_bet)
+
+    def insert_into_game_stats(self, ocr_bet: Bet, game_stats: Dict[str, Any]) -> None:
+        """Queue game stats for insertion into game_stats table"""
+        self.pending['game_stats'].append((
+            int(ocr_bet.player_id), 
+            ocr_bet.date, 
+            game_stats['points'],
+            game_stats['assists'],
+            game_stats['rebounds'],
+            game_stats['blocks'],
+            game_stats['steals'],
+            game_stats['turnovers'],
+            game_stats['three_pointers'],
+            game_stats['par'],
+            game_stats['pts_rebs'],
+            game_stats['pts_asts'],
+            game_stats['rebs_asts']
+        ))
+        # Later bets for the same player/date use the queued stats instead of the API
+        self.cached_stats[self._stats_key(ocr_bet)] = game_stats
   
-    def insert_into_unplayed_bets(self, ocr_bet: pd.Series) -> None:
-        """Add bet to unplayed_bets table.""" 
-        try:
-            with self.conn:
-                self.conn.execute("""
-                INSERT OR IGNORE INTO unplayed_bets (raw_bet_id, player_id, date)
-                VALUES (?, ?, ?)
-                """, (ocr_bet['id'], ocr_bet['player_id'], ocr_bet['date']))
-                
-        except Exception as e:
-            logger.error(f"Error marking unplayed bet id: {ocr_bet['id']}, player_id: {ocr_bet['player_id']}, date: {ocr_bet['date']}: {str(e)}")
-            raise
+    def insert_into_unplayed_bets(self, ocr_bet: Bet) -> None:
+        """Queue bet for insertion into unplayed_bets table.""" 
+        self.pending['unplayed_bets'].append((int(ocr_bet.id), int(ocr_bet.player_id), ocr_bet.date))
+        self.unplayed.add(self._stats_key(ocr_bet))
+
+    # Map of NBA API stat names to standardized stat names
+    API_STAT_NAMES = {
+        'PTS': 'points',
+        'AST': 'assists',
+        'REB': 'rebounds',
+        'BLK': 'blocks',
+        'STL': 'steals',
+        'TOV': 'turnovers',
+        'FG3M': 'three_pointers'
+    }
+
+    def _standardize_game_log(self, result_set: Dict[str, Any]) -> Dict[str, Dict[str, float]]:
+        """Standardize api_stat names and add derived stats for each game in a raw API result set.
+
+        Args:
+            result_set: PlayerGameLog result set with 'headers' and 'rowSet' lists
 
-    def _standardize_stat_names(self, api_stats: Dict[str, float]) -> Dict[str, float]:
-        """Standardize api_stat names, add derived stats, and return a dictionary with numeric values."""
-
-        # Map of NBA API stat names to standardized stat names
-        bet_type_map = {
-            'PTS': 'points',
-            'AST': 'assists',
-            'REB': 'rebounds',
-            'BLK': 'blocks',
-            'STL': 'steals',
-            'TOV': 'turnovers',
-            'FG3M': 'three_pointers'
-        }
-        
-        # Create new dict with renamed keys and ensure float values
-        renamed_stats = {}
-        for api_key, new_key in bet_type_map.items():
-            renamed_stats[new_key] = float(api_stats[api_key])
-        
-        # Ensure all base stats exist with at least 0.0
-        # @TODO: Redundant? Previously had errors with derived stats.
-        for stat in ['points', 'assists', 'rebounds']:  
-            renamed_stats[stat] = renamed_stats.get(stat, 0.0)
-        
-        # Add derived stats
-        renamed_stats['par'] = renamed_stats['points'] + renamed_stats['rebounds'] + renamed_stats['assists']
-        renamed_stats['pts_rebs'] = renamed_stats['points'] + renamed_stats['rebounds']
-        renamed_stats['pts_asts'] = renamed_stats['points'] + renamed_stats['assists']
-        renamed_stats['rebs_asts'] = renamed_stats['rebounds'] + renamed_stats['assists']
+        Returns:
+            Dict of {YYYY-MM-DD game date: {stat_name: stat_value}} with stats points, assists, rebounds,
+            blocks, steals, turnovers, three_pointers, par, pts_rebs, pts_asts, rebs_asts
+        """
+        headers = result_set['headers']
+        date_idx = headers.index('GAME_DATE')
+        stat_idxs = [(headers.index(api_name), stat_name) for api_name, stat_name in self.API_STAT_NAMES.items()]
+
+        game_log = {}
+        for row in result_set['rowSet']:
+            # Ensure dates are in YYYY-MM-DD format to match raw_ocr_bets dates
+            game_date = datetime.strptime(row[date_idx], '%b %d, %Y').strftime('%Y-%m-%d')
+            # Keep the first game if a date somehow appears twice
+            if game_date in game_log:
+                continue
 
-        return renamed_stats
+            stats = {
+                stat_name: float(row[idx]) if row[idx] is not None else float('nan')
+                for idx, stat_name in stat_idxs
+            }
 
-    def _get_unprocessed_bets(self) -> pd.DataFrame:
+            # Add derived stats
+            stats['par'] = stats['points'] + stats['rebounds'] + stats['assists']
+            stats['pts_rebs'] = stats['points'] + stats['rebounds']
+            stats['pts_asts'] = stats['points'] + stats['assists']
+            stats['rebs_asts'] = stats['rebounds'] + stats['assists']
+
+            game_log[game_date] = stats
+
+        return game_log
+
+    def _get_unprocessed_bets(self) -> List[Bet]:
         """Fetch bets from raw_ocr_bets table where is_processed=0, is_voided=0, and needs_review=0."""
         query = """
         SELECT id, player_id, bet_type, score, date, bet_line, odds
         FROM raw_ocr_bets
         WHERE is_processed = 0 AND needs_review = 0 AND is_voided = 0
         """
-        return pd.read_sql_query(query, self.conn)
-
-    def _get_game_stats_id(self, ocr_bet: pd.Series) -> int:
-        """Get the id of the game stats record for a bet."""
-        query = """
-        SELECT id FROM game_stats
-        WHERE player_id = ? AND date = ?
+        return [Bet._make(row) for row in self.conn.execute(query)]
+
+    @staticmethod
+    def _stats_key(ocr_bet: Bet) -> Tuple[int, str]:
+        """(player_id, date) key of a bet in the cached_stats, game_stats_ids, and unplayed lookups."""
+        return (int(ocr_bet.player_id), ocr_bet.date)
+
+    def _load_cached_data(self) -> None:
+        """Load game_stats and unplayed_bets into memory, keyed by (player_id, date)."""
+        stat_names = [
+            'points', 'assists', 'rebounds', 'blocks', 'steals', 'turnovers', 'three_pointers',
+            'par', 'pts_rebs', 'pts_asts', 'rebs_asts'
+        ]
+        query = f"""
+        SELECT id, player_id, date, {', '.join(stat_names)}
+        FROM game_stats
         """
-        result = self.conn.execute(query, (ocr_bet['player_id'], ocr_bet['date'])).fetchone()[0]
-        return result
+        self.cached_stats = {}
+        self.game_stats_ids = {}
+        for game_stats_id, player_id, date, *stats in self.conn.execute(query):
+            key = (int(player_id), date)
+            self.game_stats_ids[key] = game_stats_id
+            # SQLite stores NaN as NULL, so map missing stats back to NaN
+            self.cached_stats[key] = {
+                stat_name: float(stat) if stat is not None else float('nan')
+                for stat_name, stat in zip(stat_names, stats)
+            }
+
+        self.unplayed = {
+            (int(player_id), date)
+            for player_id, date in self.conn.execute("SELECT player_id, date FROM unplayed_bets")
+        }
+        logger.info(f"Loaded {len(self.cached_stats)} cached game stats and {len(self.unplayed)} unplayed player dates")
 
-    def _get_player_game_stats(self, ocr_bet: pd.Series) -> Tuple[bool, Optional[Dict[str, float]]]:
+    def _get_player_game_stats(self, ocr_bet: Bet) -> Tuple[bool, Optional[Dict[str, float]]]:
         """Fetch game statistics from cache or NBA API for a bet.
 
         Returns:
@@ -406,184 +695,167 @@ class BetProcessor:
         # Check if stats are cached in game_stats table (i.e. we processed this player/date before)
         cached_stats = self._get_cached_stats(ocr_bet)
         if cached_stats:
-            logger.info(f"Found cached stats for bet {ocr_bet['id']}, player_id: {ocr_bet['player_id']}, date: {ocr_bet['date']}")
+            logger.info(f"Found cached stats for bet {ocr_bet.id}, player_id: {ocr_bet.player_id}, date: {ocr_bet.date}")
             return True, cached_stats
 
         # Check if player/date is already marked as unplayed
         if self._in_unplayed_bets(ocr_bet):
-            logger.info(f"Found unplayed bet for player_id: {ocr_bet['player_id']}, date: {ocr_bet['date']}")
+            logger.info(f"Found unplayed bet for player_id: {ocr_bet.player_id}, date: {ocr_bet.date}")
             return True, None
 
         # Get stats from API
-        logger.info(f"Fetching stats from API for bet {ocr_bet['id']}, player_id: {ocr_bet['player_id']}, date: {ocr_bet['date']}")
+        logger.info(f"Fetching stats from API for bet {ocr_bet.id}, player_id: {ocr_bet.player_id}, date: {ocr_bet.date}")
         return False, self._get_api_stats(ocr_bet)
 
-    def _get_cached_stats(self, ocr_bet: pd.Series) -> Optional[Dict[str, float]]:
-        """Get cached game stats from database if they exist."""
-        query = """
-        SELECT points, assists, rebounds, blocks, steals, turnovers, three_pointers,
-               par, pts_rebs, pts_asts, rebs_asts
-        FROM game_stats
-        WHERE player_id = ? AND date = ?
-        """
-        try:
-            cached_stats = self.conn.execute(query, (ocr_bet['player_id'], ocr_bet['date'])).fetchone()
-            if cached_stats:
-                return {
-                    'points': float(cached_stats[0]),
-                    'assists': float(cached_stats[1]),
-                    'rebounds': float(cached_stats[2]),
-                    'blocks': float(cached_stats[3]),
-                    'steals': float(cached_stats[4]),
-                    'turnovers': float(cached_stats[5]),
-                    'three_pointers': float(cached_stats[6]),
-                    'par': float(cached_stats[7]),
-                    'pts_rebs': float(cached_stats[8]),
-                    'pts_asts': float(cached_stats[9]),
-                    'rebs_asts': float(cached_stats[10])
-                }
-            return None
-        except Exception as e:
-            logger.error(f"Error accessing cached stats for bet {ocr_bet['id']}: {str(e)}")
-            return None
+    def _get_cached_stats(self, ocr_bet: Bet) -> Optional[Dict[str, float]]:
+        """Get cached game stats loaded from the database if they exist."""
+        return self.cached_stats.get(self._stats_key(ocr_bet))
 
-    def _in_unplayed_bets(self, ocr_bet: pd.Series) -> bool:
+    def _in_unplayed_bets(self, ocr_bet: Bet) -> bool:
         """Check if bet is marked as unplayed for the given date."""
-        query = """
-        SELECT r.player_id, r.date
-        FROM raw_ocr_bets r
-        INNER JOIN unplayed_bets u ON r.player_id = u.player_id AND r.date = u.date
-        WHERE r.player_id = ? AND r.date = ?
-        """
-        try:
-            result = self.conn.execute(query, (ocr_bet['player_id'], ocr_bet['date'])).fetchone()
-            if result:
-                logger.info(f"Player {ocr_bet['player_id']} on {ocr_bet['date']} is in unplayed_bets table")
-                return True
-            return False
-        except Exception as e:
-            logger.error(f"Error checking if player is in unplayed_bets table for bet {ocr_bet['id']}, player_id: {ocr_bet['player_id']}, date: {ocr_bet['date']}: {str(e)}")
-            return False
+        if self._stats_key(ocr_bet) in self.unplayed:
+            logger.info(f"Player {ocr_bet.player_id} on {ocr_bet.date} is in unplayed_bets table")
+            return True
+        return False
 
-    def _get_api_stats(self, ocr_bet: pd.Series) -> Optional[Dict[str, float]]:
+    def _get_api_stats(self, ocr_bet: Bet) -> Optional[Dict[str, float]]:
         """Fetch game stats from NBA API for the given bet."""
         try:
-            # Wait for API to not be rate limited
-            sleep(uniform(0.5, 1))
-
-            # Pull player game log from NBA API
-            gamelog = playergamelog.PlayerGameLog(
-                player_id=int(ocr_bet['player_id']),
-                season=SEASON
-            )
-            game_log_dfs = gamelog.get_data_frames()
-            if not game_log_dfs or game_log_dfs[0].empty:
-                raise ValueError(f"No API stats found for player {ocr_bet['player_id']} on {ocr_bet['date']}")
+            game_log = self._get_player_game_log(int(ocr_bet.player_id))
+            if not game_log:
+                raise ValueError(f"No API stats found for player {ocr_bet.player_id} on {ocr_bet.date}")
             
-            # Ensure both dates are in YYYY-MM-DD format
-            game_log_df = game_log_dfs[0]
-            game_log_df['GAME_DATE'] = pd.to_datetime(game_log_df['GAME_DATE'], format='%b %d, %Y').dt.strftime('%Y-%m-%d')
-            game_date = pd.to_datetime(ocr_bet['date']).strftime('%Y-%m-%d')
-
-            # Get stats for the specific date
-            api_stats = game_log_df[game_log_df['GAME_DATE'] == game_date]
-            if not api_stats.empty:
-                logger.info(f"Found API stats for player {ocr_bet['player_id']} on {ocr_bet['date']}")
-                return self._standardize_stat_names(api_stats.iloc[0].to_dict())
+            # Get stats for the specific date, game log dates are already in YYYY-MM-DD format
+            game_date = datetime.fromisoformat(ocr_bet.date).strftime('%Y-%m-%d')
+            if game_date in game_log:
+                logger.info(f"Found API stats for player {ocr_bet.player_id} on {ocr_bet.date}")
+                return game_log[game_date]
             
-            logger.info(f"No API stats found for player {ocr_bet['player_id']} on {ocr_bet['date']}")
+            logger.info(f"No API stats found for player {ocr_bet.player_id} on {ocr_bet.date}")
             return None
 
         except (Timeout, RequestException) as e:
-            logger.error(f"API error for bet {ocr_bet['id']}: {str(e)}")
-            quit()
+            logger.error(f"API error for bet {ocr_bet.id} after {NBA_API_MAX_RETRIES} attempts: {str(e)}")
+            raise
         except Exception as e:
-            logger.error(f"Unexpected error processing bet {ocr_bet['id']}: {str(e)}", exc_info=True)
+            logger.error(f"Unexpected error processing bet {ocr_bet.id}: {str(e)}", exc_info=True)
             raise
 
-    def _calculate_results(self, ocr_bet: pd.Series, game_stats: Dict[str, Any]) -> Tuple[str, float, float, float, str]:
-        """Calculate bet result and associated delta of ocr_bet based on game_stats"
+    def _get_player_game_log(self, player_id: int) -> Dict[str, Dict[str, float]]:
+        """Get a player's SEASON game log, fetching it from the NBA API only on the first call for the player.
         
-        Returns: Tuple of [result, result_delta, stat_value, line_value, over_under]
+        Returns:
+            Dict of {YYYY-MM-DD game date: standardized game stats} (empty if the API returned nothing)
         """
+        if player_id in self.game_logs:
+            return self.game_logs[player_id]
+
+        # Wait for the background fetch if one was started, re-raising its error
+        future = self.game_log_futures.pop(player_id, None)
+        if future is not None:
+            return future.result()
+
+        return self._fetch_player_game_log(player_id)
+
+    def _fetch_player_game_log(self, player_id: int) -> Dict[str, Dict[str, float]]:
+        """Fetch and cache a player's SEASON game log from the NBA API.
+
+        Safe to run in prefetch threads: requests are spaced by the shared rate limiter.
+
+        Returns:
+            Dict of {YYYY-MM-DD game date: standardized game stats} (empty if the API returned nothing)
+        """
+        # Pull player game log from NBA API, retrying with exponential backoff on network errors
+        for attempt in range(NBA_API_MAX_RETRIES):
+            # Wait for API to not be rate limited
+            self.rate_limiter.wait()
+            try:
+                logger.info(f"Fetching game log from API for player_id: {player_id}")
+                gamelog = playergamelog.PlayerGameLog(
+                    player_id=player_id,
+                    season=SEASON,
+                    headers=NBA_API_HEADERS,
+                    timeout=NBA_API_TIMEOUT
+                )
+                break
+            except RequestException as e:
+                if attempt == NBA_API_MAX_RETRIES - 1:
+                    raise
+                backoff = 2 ** attempt + uniform(0, 1)
+                logger.warning(
+                    f"API error for player_id: {player_id} (attempt {attempt + 1}/{NBA_API_MAX_RETRIES}): {str(e)}. "
+                    f"Retrying in {backoff:.1f}s"
+                )
+                # Stale keep-alive connections cause repeated timeouts, so drop the pooled connections.
+                # Only the HTTP adapters are closed; the session and its response cache stay shared.
+                for adapter in self.api_session.adapters.values():
+                    adapter.close()
+                sleep(backoff)
+
+        # Walk the raw JSON result set; a DataFrame is overkill for looking up a few dates
+        result_sets = gamelog.get_dict()['resultSets']
+        game_log = self._standardize_game_log(result_sets[0]) if result_sets else {}
+
+        self.game_logs[player_id] = game_log
+        return game_log
+
+    def _calculate_results(
+        self, stat_values: np.ndarray, line_values: np.ndarray, is_over: np.ndarray, odds: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Calculate results and associated deltas for a batch of bets with array operations.
+
+        Args:
+            stat_values: Value of the stat being bet for each bet
+            line_values: Value of the line being bet for each bet
+            is_over: True for over bets, False for under bets
+            odds: Odds of each bet
         
-        # Value of stat being bet. (e.g. if bet_type = 'points' and points = 21, stat_value = 21) 
-        stat_value = float(game_stats[ocr_bet['bet_type']])
-
-        # Value of line being bet. (e.g. if bet_line = 'o21.5', line_value = 21.5)
-        line_value = float(ocr_bet['bet_line'][1:])
-
-        # Determine over/under 
-        if ocr_bet['bet_line'].startswith('o'):
-            over_under = "Over" 
-        elif ocr_bet['bet_line'].startswith('u'):
-            over_under = "Under"
-        else:
-            # @TODO: Check if redundant; we already validated this? 
-            raise ValueError(f"Invalid bet line format: {ocr_bet['bet_line']}. Must start with 'o' or 'u'")
-        
-        result = (
-            "Win" if (stat_value > line_value and over_under == "Over") or
-                    (stat_value < line_value and over_under == "Under") else
-            "Loss" if (stat_value < line_value and over_under == "Over") or
-                    (stat_value > line_value and over_under == "Under") else
-            "Push"
-        )
-        
-        # Design decision: all bet lines have been .5, so 'push' result more likely to be an OCR error than a true push 
-        if result == "Push":
-            raise ValueError("Bet resulted in a push")
-            
+        Returns: Tuple of arrays [result ("Win"/"Loss"), result_delta, is_push]
+        """
+        win = np.where(is_over, stat_values > line_values, stat_values < line_values)
+        is_push = stat_values == line_values
+        results = np.where(win, "Win", "Loss")
+
         # Calculate result delta based on bet odds
-        if result == "Win": 
-            result_delta = 100
-        else:
-            odds = float(ocr_bet['odds'])
-            result_delta = -np.round((100 / (odds / 100)), 0) if odds > 0 else odds
+        with np.errstate(divide='ignore'):
+            loss_deltas = np.where(odds > 0, -np.round(100 / (odds / 100), 0), odds)
+        result_deltas = np.where(win, 100.0, loss_deltas)
             
-        return result, result_delta, stat_value, line_value, over_under
-
-    def _calculate_score_range(self, score: float) -> str:
-        """Calculate score range category."""
-
-        score_ranges = [
-        (20, 25, "20-25"),
-        (25, 30, "25-30"),
-        (30, 35, "30-35"),
-        (35, 40, "35-40"),
-        (40, 45, "40-45"),
-        (45, 50, "45-50")
-        ]
+        return results, result_deltas, is_push
 
-        score = float(score)
-        if score < 20:
-            # @TODO: Check if redundant; we already validated this? 
-            raise ValueError("Score is less than 20")
-            
-        for low, high, range_str in score_ranges:
-            if low <= score < high:
-                return range_str
-                
-        return "50+"
+    def _calculate_score_ranges(self, scores: np.ndarray) -> np.ndarray:
+        """Calculate score range categories for an array of scores of at least 20 with one binary search."""
+        return SCORE_RANGE_LABELS[np.searchsorted(SCORE_RANGE_EDGES, scores, side='right') - 1]
 
-    def _mark_bet_processed(self, ocr_bet: pd.Series) -> None:
-        """Mark bet as processed in raw_ocr_bets table."""
-        self.conn.execute("""
-        UPDATE raw_ocr_bets 
-        SET is_processed = 1
-        WHERE id = ?
-        """, (ocr_bet['id'],))
+    def _mark_bet_processed(self, ocr_bet: Bet) -> None:
+        """Queue bet to be marked as processed in raw_ocr_bets table."""
+        self.pending['processed_ids'].append(int(ocr_bet.id))
 
     # Backup Methods
+    # Pages copied per step of the online backup, so other connections can work in between steps
+    BACKUP_PAGES_PER_STEP = 1000
+
     def create_backup(self) -> None:
-        """Create timestamped backup of database."""
+        """Create timestamped backup of database.
+
+        Uses SQLite's online backup over the open connection, so the copy is consistent
+        even with uncheckpointed WAL pages or writes from other connections.
+        """
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         backup_path = Path('backups') / f'sports_bets_{timestamp}.db'
         backup_path.parent.mkdir(exist_ok=True)
-        shutil.copy2(self.db_file, backup_path)
+        backup_conn = sqlite3.connect(backup_path)
+        try:
+            self.conn.backup(backup_conn, pages=self.BACKUP_PAGES_PER_STEP)
+        finally:
+            backup_conn.close()
         logger.info(f"Created database backup: {backup_path}")
 
     def restore_from_backup(self, backup_file: str) -> None:
-        """Restore database from backup file."""
-        shutil.copy2(backup_file, self.db_file)
+        """Restore database from backup file by copying its pages into the open connection."""
+        backup_conn = sqlite3.connect(f"{Path(backup_file).as_uri()}?mode=ro", uri=True)
+        try:
+            backup_conn.backup(self.conn, pages=self.BACKUP_PAGES_PER_STEP)
+        finally:
+            backup_conn.close()
         logger.info(f"Restored database from backup: {backup_file}")
\ No newline at end of file
@@ -1,11 +1,12 @@
 import pandas as pd
-import sqlite3
+import numpy as np
 from datetime import datetime
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import sys
 import os
-from typing import List
+from typing import List, Dict, Tuple, Any, Mapping
 import re
 
 # Add the project root directory to Python path
@@ -14,17 +15,53 @@ if project_root not in sys.path:
     sys.path.append(project_root)
 
 from src.utils.config import (
-    DB_PATH, IMAGES_DIR, REVIEW_IMAGES_DIR, REVIEW_CSV_DIR
+    IMAGES_DIR, REVIEW_IMAGES_DIR, REVIEW_CSV_DIR
 )
+from src.database.init_db import connect_db
 from src.utils.logger import setup_logger
-from src.utils.constants import TYPE_REPLACEMENTS, VALID_RANGES
+from src.utils.constants import (
+    VALID_BET_TYPES, MIN_SCORE, MAX_SCORE, MIN_ODDS, MAX_ODDS, REVIEW_COPY_WORKERS, CSV_WRITE_BUFFER_SIZE
+)
 logger = setup_logger(__name__)
 
+# Valid bet line format: 'o' or 'u' followed by a number ending in .5
+_BET_LINE_RE = re.compile(r'^[ou]\d+\.5$')
+
+
+def _in_range_mask(values: pd.Series, lower_bound: float, upper_bound: float) -> np.ndarray:
+    """True where values are numbers within [lower_bound, upper_bound]; missing or non-numeric values are False.
+
+    Compares a contiguous float64 array directly, so NaN fails both bounds without a separate isna pass.
+    """
+    array = pd.to_numeric(values, errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+    return (array >= lower_bound) & (array <= upper_bound)
+
+
+def _fast_copy(source: Path, dest: Path) -> None:
+    """Hard link source to dest, falling back to a full copy across filesystems or if dest exists.
+
+    Review images are only viewed and later unlinked, so sharing the original's inode is safe.
+    """
+    try:
+        os.link(source, dest)
+    except FileExistsError:
+        # Already linked by an earlier export
+        if not os.path.samefile(source, dest):
+            shutil.copy2(source, dest)
+    except OSError:
+        shutil.copy2(source, dest)
+
 class ReviewHandler:
     def __init__(self):
         """Initialize the ReviewHandler."""
         REVIEW_IMAGES_DIR.mkdir(parents=True, exist_ok=True)
         REVIEW_CSV_DIR.mkdir(parents=True, exist_ok=True)
+        # One connection for the handler's lifetime keeps SQLite's page cache warm between calls
+        self._conn = connect_db()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
 
     def get_entries_for_review(self):
         """Get all entries from raw_ocr_bets table that need review."""
@@ -47,21 +84,32 @@ class ReviewHandler:
         AND r.is_voided = 0
         """
         
-        with sqlite3.connect(DB_PATH) as conn:
-            df = pd.read_sql_query(query, conn)
-            if df.empty:
-                logger.info("No entries need review")
-            return df
+        df = pd.read_sql_query(query, self._conn)
+        if df.empty:
+            logger.info("No entries need review")
+        return df
 
     def _clear_review_folder(self):
         """Clear all files in the review images folder."""
-        for img in REVIEW_IMAGES_DIR.glob('*'):
-            try:
-                img.unlink()  # Delete file
-            except Exception as e:
-                logger.error(f"Error deleting {img}: {e}")
+        # scandir yields directory entries without building a Path or stat'ing each file
+        with os.scandir(REVIEW_IMAGES_DIR) as entries:
+            for entry in entries:
+                try:
+                    os.unlink(entry.path)  # Delete file
+                except OSError as e:
+                    logger.error(f"Error deleting {entry.path}: {e}")
         logger.info(f"Cleared review images folder: {REVIEW_IMAGES_DIR}")
 
+    def _copy_one(self, img: str) -> None:
+        """Copy one image from the images folder to the review images folder, logging any error."""
+        try:
+            source = IMAGES_DIR / img
+            dest = REVIEW_IMAGES_DIR / img
+            if source.exists():
+                _fast_copy(source, dest)
+        except Exception as e:
+            logger.error(f"Error copying {img}: {e}")
+
     def export_for_review(self, output_file=None):
         """Export entries needing review to CSV and copy images to review folder."""
         df = self.get_entries_for_review()
@@ -75,24 +123,19 @@ class ReviewHandler:
             output_file = REVIEW_CSV_DIR / f"reviews_{timestamp}.csv"
 
         # Export to CSV
-        df.to_csv(output_file, index=False)
+        with open(output_file, 'w', newline='', buffering=CSV_WRITE_BUFFER_SIZE) as f:
+            df.to_csv(f, index=False)
         
-        # Copy images to review folder
-        for img in df['image_source'].unique():
-            try:
-                source = IMAGES_DIR / img
-                dest = REVIEW_IMAGES_DIR / img
-                if source.exists():
-                    shutil.copy2(source, dest)
-            except Exception as e:
-                logger.error(f"Error copying {img}: {e}")
+        # Copy images to review folder in parallel
+        with ThreadPoolExecutor(max_workers=REVIEW_COPY_WORKERS) as executor:
+            list(executor.map(self._copy_one, df['image_source'].unique()))
 
         logger.info(f"Exported {len(df)} entries to {output_file}")
         logger.info(f"{len(df['image_source'].unique())} images copied to {REVIEW_IMAGES_DIR}")
         return output_file
 
     # @TODO: this is currently a near-duplicate of the function in image_processor.py
-    def bet_needs_review(self, bet_entry: pd.Series) -> tuple[bool, List[str]]:
+    def bet_needs_review(self, bet_entry: Mapping[str, Any], players_by_name: Dict[str, int]) -> tuple[bool, List[str]]:
         """Determine if a bet needs manual review.
         A bet needs review if any of these conditions are met:
         - Missing or invalid player name
@@ -104,7 +147,8 @@ class ReviewHandler:
         - Date is missing or invalid
         
         Args:
-            bet_entry: Series containing the bet entry data
+            bet_entry: Series or dict containing the bet entry data
+            players_by_name: Dict of {player name: nba_api_id} from the players table
             
         Returns:
             Tuple of (needs_review, list of reasons for review)
@@ -118,10 +162,7 @@ class ReviewHandler:
 
         # Check player_id
         if player_name:
-            conn = sqlite3.connect(DB_PATH)
-            player_id = conn.execute("""
-                SELECT nba_api_id FROM players WHERE name = ?
-            """, (player_name,)).fetchone()[0]
+            player_id = players_by_name.get(player_name)
             if not player_id:
                 reasons.add(f"Player not found: {player_name}")
 
@@ -129,7 +170,7 @@ class ReviewHandler:
         bet_type = bet_entry['bet_type'] if not pd.isna(bet_entry['bet_type']) else None
         if not bet_type:
             reasons.add("Missing bet type")
-        elif bet_type not in TYPE_REPLACEMENTS.values():
+        elif bet_type not in VALID_BET_TYPES:
             reasons.add(f"Invalid bet type: {bet_type}")
                 
         # Check score
@@ -137,10 +178,9 @@ class ReviewHandler:
             reasons.add("Missing score")
         else:
             try:
-                score_lower_bound, score_upper_bound = VALID_RANGES['score']
                 score = float(bet_entry['score'])
-                if not score_lower_bound <= score <= score_upper_bound:
-                    reasons.add(f"Score out of expected range [{score_lower_bound},{score_upper_bound}]: {score}")
+                if not MIN_SCORE <= score <= MAX_SCORE:
+                    reasons.add(f"Score out of expected range [{MIN_SCORE},{MAX_SCORE}]: {score}")
             except ValueError:
                 reasons.add(f"Invalid score format: {bet_entry['score']}")
                     
@@ -148,7 +188,7 @@ class ReviewHandler:
         if pd.isna(bet_entry['bet_line']):
             reasons.add("Missing bet line")
         else:
-            if not re.match(r'^[ou]\d+\.5$', str(bet_entry['bet_line'])):
+            if not _BET_LINE_RE.match(str(bet_entry['bet_line'])):
                 reasons.add(f"Invalid bet line format: {bet_entry['bet_line']}")
                     
         # Check odds
@@ -157,9 +197,8 @@ class ReviewHandler:
         else:
             try:
                 odds = int(bet_entry['odds'])
-                odds_lower_bound, odds_upper_bound = VALID_RANGES['odds']
-                if not odds_lower_bound <= odds <= odds_upper_bound:
-                    reasons.add(f"Odds out of expected range [{odds_lower_bound},{odds_upper_bound}]: {odds}")
+                if not MIN_ODDS <= odds <= MAX_ODDS:
+                    reasons.add(f"Odds out of expected range [{MIN_ODDS},{MAX_ODDS}]: {odds}")
             except ValueError:
                 reasons.add(f"Invalid odds format: {bet_entry['odds']}")
                     
@@ -174,7 +213,35 @@ class ReviewHandler:
 
         return (len(reasons) > 0, list(reasons))
 
-    def update_reviewed_entries(self, input_file):
+    def _validate_df(self, df: pd.DataFrame, players_by_name: Dict[str, int]) -> Tuple[pd.Series, pd.Series]:
+        """Check every entry of a reviewed DataFrame at once with the rules of bet_needs_review.
+
+        Only entries that fail are passed to bet_needs_review, to build their reasons.
+
+        Args:
+            df: DataFrame of reviewed entries
+            players_by_name: Dict of {player name: nba_api_id} from the players table
+
+        Returns:
+            Tuple of (needs_review mask, Series of lists of reasons for review), both indexed like df
+        """
+        valid = (
+            df['player'].isin(players_by_name.keys())
+            & df['bet_type'].isin(VALID_BET_TYPES)
+            & _in_range_mask(df['score'], MIN_SCORE, MAX_SCORE)
+            & df['bet_line'].astype(str).str.match(_BET_LINE_RE, na=False)
+            & _in_range_mask(df['odds'], MIN_ODDS, MAX_ODDS)
+            & pd.to_datetime(df['date'], errors='coerce', format='mixed').notna()
+        )
+        needs_review = ~valid
+
+        reasons = pd.Series([[] for _ in range(len(df))], index=df.index, dtype=object)
+        for idx, entry in zip(df.index[needs_review], df[needs_review].to_dict('records')):
+            reasons[idx] = self.bet_needs_review(entry, players_by_name)[1]
+
+        return needs_review, reasons
+
+    def update_reviewed_entries(self, input_file, reexport: bool = True):
         """Update database with reviewed entries.
         
         For entries in the csv file:
@@ -184,6 +251,7 @@ class ReviewHandler:
         
         Args:
             input_file: Path to CSV file containing reviewed entries
+            reexport: Export the entries still needing review for the next review cycle
         """
         # If input file is not found, check if its in the review csv directory
         if not Path(input_file).exists():
@@ -198,7 +266,11 @@ class ReviewHandler:
             logger.info("No entries to update")
             return
 
-        with sqlite3.connect(DB_PATH) as conn:
+        conn = self._conn
+        with conn:
+            # Load players once instead of looking up each reviewed entry's player
+            players_by_name = dict(conn.execute("SELECT name, nba_api_id FROM players").fetchall())
+
             # Get all entries that currently need review
             db_df = pd.read_sql_query("""
                 SELECT id, bet_type, score, bet_line, odds
@@ -207,64 +279,87 @@ class ReviewHandler:
             """, conn)
 
             # Find entries deleted from CSV and mark as voided in DB
-            deleted_ids = set(db_df['id']) - set(csv_df['id'])
-            if deleted_ids:
+            # CSV ids aren't assumed unique in case a reviewer duplicated a row
+            deleted_ids = np.setdiff1d(db_df['id'].to_numpy(), csv_df['id'].to_numpy())
+            if deleted_ids.size:
+                # Join against a temp table of ids: one prepared UPDATE for any number of ids,
+                # with no bound parameter limit
+                conn.execute("CREATE TEMP TABLE IF NOT EXISTS deleted_review_ids (id INTEGER PRIMARY KEY)")
+                conn.execute("DELETE FROM deleted_review_ids")
+                conn.executemany(
+                    "INSERT OR IGNORE INTO deleted_review_ids (id) VALUES (?)",
+                    [(bet_id,) for bet_id in deleted_ids.tolist()]
+                )
                 conn.execute("""
                     UPDATE raw_ocr_bets
                     SET is_voided = 1
-                    WHERE id IN ({})
-                """.format(','.join('?' * len(deleted_ids))), list(deleted_ids))
+                    WHERE id IN (SELECT id FROM deleted_review_ids)
+                """)
                 logger.info(f"Marked {len(deleted_ids)} deleted entries as voided")
 
-            # Process CSV entries
-            for _, bet in csv_df.iterrows():
+            # Validate all CSV entries at once
+            needs_review_mask, reasons_by_entry = self._validate_df(csv_df, players_by_name)
+
+            # Collect updates for valid CSV entries
+            updates = []
+            for bet, needs_review, reasons in zip(
+                csv_df.itertuples(index=False), needs_review_mask, reasons_by_entry
+            ):
                 try:        
                     # If entry is updated, update entry in database and mark as reviewed
-                    needs_review, reasons = self.bet_needs_review(bet)
-
-                    # Grab player ID of new name
-                    player_id = conn.execute("""
-                        SELECT nba_api_id FROM players WHERE name = ?
-                    """, (bet['player'],)).fetchone()[0]
-
-        
-                    # Update entry in database  
+                    # Queue valid entry with player ID of new name
                     if not needs_review: 
-                        conn.execute("""
-                        UPDATE raw_ocr_bets
-                        SET needs_review = 0,
-                            player_id = ?,
-                            bet_type = ?,
-                            score = ?,
-                            bet_line = ?,
-                            odds = ?
-                        WHERE id = ?
-                        """, (
-                            player_id,
-                            bet['bet_type'],
-                            bet['score'],
-                            bet['bet_line'],
-                            bet['odds'],
-                            bet['id']
+                        updates.append((
+                            players_by_name.get(bet.player),
+                            bet.bet_type,
+                            bet.score,
+                            bet.bet_line,
+                            bet.odds,
+                            bet.id
                         ))
-                        logger.info(f"Updated valid entry {bet['id']}")
 
                     # If entry is still invalid, ignore
                     else:
-                        logger.debug(f"Ignoring invalid bet {bet['id']}: {reasons}")
+                        logger.debug("Ignoring invalid bet %s: %s", bet.id, reasons)
                         
                 except Exception as e:
-                    logger.error(f"Error processing entry {bet['id']}: {e}")
+                    logger.error(f"Error processing entry {bet.id}: {e}")
+
+            # Update all valid entries in database with one prepared statement.
+            # OR IGNORE skips an entry whose edits collide with another bet instead of failing the batch;
+            # it stays in review.
+            updated = conn.executemany("""
+            UPDATE OR IGNORE raw_ocr_bets
+            SET needs_review = 0,
+                player_id = ?,
+                bet_type = ?,
+                score = ?,
+                bet_line = ?,
+                odds = ?
+            WHERE id = ?
+            """, updates).rowcount
+            logger.info(f"Updated {updated} valid entries")
+            if updated < len(updates):
+                logger.warning(f"Skipped {len(updates) - updated} entries that conflict with existing bets")
             
             conn.commit()
         
         logger.info(f"Processed {len(csv_df)} reviewed entries")
         logger.info(f"Marked {len(deleted_ids)} entries as voided")
+        if not reexport:
+            return
+
+        remaining = self._conn.execute("""
+            SELECT COUNT(*) FROM raw_ocr_bets WHERE needs_review = 1 AND is_voided = 0
+        """).fetchone()[0]
         logger.info(f"Updating csv and image folders...")
         
-        # Clear review folder and export new entries
+        # Clear review folder and export new entries (the review query and image copies are skipped if none remain)
         self._clear_review_folder()
-        self.export_for_review()
+        if remaining:
+            self.export_for_review()
+        else:
+            logger.info("No entries need review")
 
 
 if __name__ == "__main__":
@@ -273,13 +368,17 @@ if __name__ == "__main__":
     parser.add_argument('--export', action='store_true', help='Export entries needing review')
     parser.add_argument('--update', type=str, help='CSV file with reviewed entries')
     parser.add_argument('--output', type=str, help='Output file for export (optional)')
+    parser.add_argument('--no-reexport', action='store_true', help='Skip exporting remaining entries after --update')
     
     args = parser.parse_args()
     handler = ReviewHandler()
 
-    if args.export:
-        handler.export_for_review(args.output)
-    elif args.update:
-        handler.update_reviewed_entries(args.update)
-    else:
-        logger.error("Please specify --export or --update")
\ No newline at end of file
+    try:
+        if args.export:
+            handler.export_for_review(args.output)
+        elif args.update:
+            handler.update_reviewed_entries(args.update, reexport=not args.no_reexport)
+        else:
+            logger.error("Please specify --export or --update")
+    finally:
+        handler.close()
\ No newline at end of file
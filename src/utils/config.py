@@ -23,6 +23,17 @@ UPDATES_DIR = REVIEWS_DIR / "update_csvs"  # Updates
 
 # Database
 DB_PATH = ROOT_DIR / "sports_bets.db"
+NBA_API_CACHE_PATH = DATA_DIR / "nba_api_cache.sqlite"  # HTTP cache for NBA API responses
+# Applied to every connection opened with connect_db; journal_mode=WAL is persisted in the
+# database file, the others only last for the lifetime of the connection
+SQLITE_INIT_PRAGMAS = [
+    "journal_mode=WAL",
+    "synchronous=NORMAL",
+    "temp_store=MEMORY",
+    "cache_size=-64000",    # 64MB page cache
+    "mmap_size=268435456",  # 256MB memory-mapped I/O
+    "foreign_keys=ON"       # Rejects orphaned rows and cascades raw_ocr_bets deletes
+]
 
 # Credentials
 CREDENTIALS_PATH = SRC_DIR / "utils" / "sensitive" / "credentials.json"
@@ -31,6 +42,7 @@ CREDENTIALS_PATH = SRC_DIR / "utils" / "sensitive" / "credentials.json"
 
 # Ensure paths are strings for sqlite
 DB_PATH = str(DB_PATH)
+NBA_API_CACHE_PATH = str(NBA_API_CACHE_PATH)
 CREDENTIALS_PATH = str(CREDENTIALS_PATH)
 
 # Create necessary directories
@@ -47,5 +59,7 @@ __all__ = [
     'VOIDED_IMAGES_DIR',
     'REVIEW_CSV_DIR',
     'DB_PATH',
+    'NBA_API_CACHE_PATH',
+    'SQLITE_INIT_PRAGMAS',
     'CREDENTIALS_PATH',
 ] 
\ No newline at end of file
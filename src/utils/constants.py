@@ -1,15 +1,67 @@
 """
 Constants used throughout the NBA Props Analyzer.
 """
+import os
 
 # NBA Season 
 SEASON = '2024-25'
 
+# NBA API HTTP cache lifetime. Kept short because a player's game log changes as soon
+# as a new game is played, and a stale log would mark that game's bets as unplayed.
+NBA_API_CACHE_EXPIRE_SECONDS = 60 * 60
+# Attempts per NBA API request before giving up, with exponential backoff between them
+NBA_API_MAX_RETRIES = 5
+# stats.nba.com answers quickly with browser-like headers and can hang for seconds without them
+NBA_API_HEADERS = {
+    'Host': 'stats.nba.com',
+    'Connection': 'keep-alive',
+    'Accept': 'application/json, text/plain, */*',
+    'Accept-Language': 'en-US,en;q=0.9',
+    'Accept-Encoding': 'gzip, deflate, br',
+    'Referer': 'https://www.nba.com/',
+    'Origin': 'https://www.nba.com',
+    'x-nba-stats-origin': 'stats',
+    'x-nba-stats-token': 'true',
+    'User-Agent': (
+        'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+        '(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+    )
+}
+# Seconds before an NBA API request times out and is retried
+NBA_API_TIMEOUT = 10
+# Game logs fetched concurrently ahead of the bet loop. Requests are still spaced to
+# NBA_API_REQUESTS_PER_SECOND across all workers so stats.nba.com doesn't throttle us.
+NBA_API_WORKERS = 3
+NBA_API_REQUESTS_PER_SECOND = 1
+
+# Read-only connections BetProcessor uses to run its validation queries concurrently
+VALIDATION_WORKERS = 4
+
+# OCR batching: images decoded and detected together, and text crops recognized together.
+# Detection activations scale with image size, so keep the image batch small.
+OCR_IMAGE_BATCH_SIZE = 4
+OCR_RECOGNIZER_BATCH_SIZE = 32
+# Threads OCR'ing image batches in parallel. On GPU, the second worker decodes the
+# next batch while the current one runs on the device.
+OCR_CPU_WORKERS = min(8, os.cpu_count() or 1)
+OCR_GPU_WORKERS = 2
+# Threads copying flagged images to the review folder; copies are I/O bound
+REVIEW_COPY_WORKERS = 8
+# Write buffer for review CSV exports, so each file is written with a few large write() calls
+CSV_WRITE_BUFFER_SIZE = 4 * 1024 * 1024
+# Sheets uploads wait until this many results are pending, or the oldest has waited this long,
+# so the Google auth/read/write round-trips are spread over more bets
+UPLOAD_MIN_BATCH = 20
+UPLOAD_MAX_WAIT_MINUTES = 60
+
 # Validation ranges
 VALID_RANGES = {
     'score': (20.00, 100.00),
     'odds': (-1000, 1000)
 }
+# Unpacked bounds for per-row checks
+MIN_SCORE, MAX_SCORE = VALID_RANGES['score']
+MIN_ODDS, MAX_ODDS = VALID_RANGES['odds']
 
 # Player name standardization mappings
 NAME_REPLACEMENTS = {
@@ -82,10 +134,13 @@ TYPE_REPLACEMENTS = {
     'Rebounds': 'rebounds'
 }
 
+# Standardized bet types, for membership checks
+VALID_BET_TYPES = frozenset(TYPE_REPLACEMENTS.values())
+
 # Ordered bet types as they appear in images
-ORDERED_OCR_BET_TYPES = [
+ORDERED_OCR_BET_TYPES = (
     "Pts+Reb+Ast", "Pts+Reb", "Pts+Ast", "Reb+Ast",
     "Blocks", "Steals", "Turnovers", "Points",
     "Assists", "Rebounds", "3pts"
-]
+)
 
@@ -1,7 +1,15 @@
-import sqlite3
 import pandas as pd
 from datetime import datetime, date
 import logging
+import sys
+from pathlib import Path
+
+# Add the project root directory to Python path
+project_root = str(Path(__file__).parent.parent.parent)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from src.database.init_db import connect_db
 
 logging.basicConfig(
     level=logging.INFO,
@@ -12,9 +20,85 @@ logging.basicConfig(
     ]
 )
 
+# Validation checks: (check name, issue description logged with the row count,
+# query returning a row_id and detail for each offending row)
+VALIDATION_CHECKS = [
+    # 1. Orphaned records
+    ("orphaned_bets", "bets with invalid player_ids", """
+        SELECT id AS row_id, printf('player_id=%s', player_id) AS detail
+        FROM raw_ocr_bets r
+        WHERE player_id NOT IN (SELECT nba_api_id FROM players)
+        AND player_id IS NOT NULL
+    """),
+
+    # 2. Inconsistent processing status
+    ("inconsistent_status", "bets with inconsistent status flags", """
+        SELECT id AS row_id,
+               printf('is_processed=%s needs_review=%s is_voided=%s', is_processed, needs_review, is_voided) AS detail
+        FROM raw_ocr_bets
+        WHERE (is_processed = 1 AND needs_review = 1)
+        OR (is_processed = 1 AND is_voided = 1)
+        OR (needs_review = 1 AND is_voided = 1)
+    """),
+
+    # 3. Duplicate entries (row_id is the first bet of each duplicate group)
+    ("duplicates", "potential duplicate bets", """
+        SELECT MIN(r.id) AS row_id,
+               printf('%s %s %s %s %s count=%d', p.name, r.date, r.bet_type, r.bet_line, r.score, COUNT(*)) AS detail
+        FROM raw_ocr_bets r
+        JOIN players p ON r.player_id = p.nba_api_id
+        WHERE r.is_voided = 0 AND r.needs_review = 0
+        GROUP BY r.player_id, r.date, r.bet_type, r.bet_line, r.score, p.name
+        HAVING COUNT(*) > 1
+    """),
+
+    # 4. bet_results integrity
+    ("invalid_results", "inconsistent bet results", """
+        SELECT br.id AS row_id, printf('%s %s %s', br.result, br.result_delta, r.bet_line) AS detail
+        FROM bet_results br
+        JOIN raw_ocr_bets r ON br.raw_bet_id = r.id
+        WHERE (br.result = 'Win' AND br.result_delta != 100)
+        OR (br.result = 'Loss' AND br.result_delta >= 0)
+        OR (br.result = 'Push' AND br.result_delta != 0)
+    """),
+
+    # 5. Missing game stats
+    ("missing_stats", "bet results with missing game stats", """
+        SELECT br.id AS row_id, printf('player_id=%s game_stats_id=%s', br.player_id, br.game_stats_id) AS detail
+        FROM bet_results br
+        LEFT JOIN game_stats gs ON br.game_stats_id = gs.id
+        WHERE gs.id IS NULL
+    """),
+
+    # 6. Date ranges
+    ("invalid_dates", "bets with suspicious dates", """
+        SELECT id AS row_id, printf('date=%s', date) AS detail
+        FROM raw_ocr_bets
+        WHERE date > CURRENT_DATE
+        OR date < '2023-01-01'
+    """),
+
+    # 7. Unprocessed bets in unplayed_bets
+    ("unplayed_issues", "unplayed bets marked as unprocessed", """
+        SELECT r.id AS row_id, printf('is_processed=%s', r.is_processed) AS detail
+        FROM raw_ocr_bets r
+        JOIN unplayed_bets u ON r.id = u.raw_bet_id
+        WHERE r.is_processed = 0
+    """),
+
+    # 8. Bet line format
+    ("invalid_lines", "bets with invalid bet line format", """
+        SELECT id AS row_id, printf('bet_line=%s', bet_line) AS detail
+        FROM raw_ocr_bets
+        WHERE bet_line NOT LIKE 'o%' 
+        AND bet_line NOT LIKE 'u%'
+        AND bet_line IS NOT NULL
+    """)
+]
+
 def validate_database(db_file="sports_bets.db"):
     """Validate database integrity and check for potential issues"""
-    conn = sqlite3.connect(db_file)
+    conn = connect_db(db_file)
     issues_found = False
 
     def log_issue(message):
@@ -23,121 +107,29 @@ def validate_database(db_file="sports_bets.db"):
         logging.error(message)
 
     try:
-        # 1. Check for orphaned records
-        logging.info("Checking for orphaned records...")
-        
-        orphaned_bets = pd.read_sql("""
-            SELECT id, player_id 
-            FROM raw_ocr_bets r
-            WHERE player_id NOT IN (SELECT nba_api_id FROM players)
-            AND player_id IS NOT NULL
-        """, conn)
-        if not orphaned_bets.empty:
-            log_issue(f"Found {len(orphaned_bets)} bets with invalid player_ids")
-            print(orphaned_bets)
-
-        # 2. Check for inconsistent processing status
-        logging.info("Checking processing status consistency...")
-        
-        inconsistent_status = pd.read_sql("""
-            SELECT id, is_processed, needs_review, is_voided
-            FROM raw_ocr_bets
-            WHERE (is_processed = 1 AND needs_review = 1)
-            OR (is_processed = 1 AND is_voided = 1)
-            OR (needs_review = 1 AND is_voided = 1)
-        """, conn)
-        if not inconsistent_status.empty:
-            log_issue(f"Found {len(inconsistent_status)} bets with inconsistent status flags")
-            print(inconsistent_status)
-
-        # 3. Check for duplicate entries
-        logging.info("Checking for duplicate bets...")
-        
-        duplicates = pd.read_sql("""
-            SELECT p.name, r.date, r.bet_type, r.bet_line, r.score, COUNT(*) as count
-            FROM raw_ocr_bets r
-            JOIN players p ON r.player_id = p.nba_api_id
-            WHERE r.is_voided = 0 AND r.needs_review = 0
-            GROUP BY r.player_id, r.date, r.bet_type, r.bet_line, r.score, p.name
-            HAVING count > 1
-        """, conn)
-        if not duplicates.empty:
-            log_issue(f"Found {len(duplicates)} potential duplicate bets")
-            print(duplicates)
-
-        # 4. Validate bet_results integrity
-        logging.info("Validating bet results...")
-        
-        invalid_results = pd.read_sql("""
-            SELECT br.id, br.result, br.result_delta, r.bet_line
-            FROM bet_results br
-            JOIN raw_ocr_bets r ON br.raw_bet_id = r.id
-            WHERE (br.result = 'Win' AND br.result_delta != 100)
-            OR (br.result = 'Loss' AND br.result_delta >= 0)
-            OR (br.result = 'Push' AND br.result_delta != 0)
-        """, conn)
-        if not invalid_results.empty:
-            log_issue(f"Found {len(invalid_results)} inconsistent bet results")
-            print(invalid_results)
-
-        # 5. Check for missing game stats
-        logging.info("Checking for missing game stats...")
-        
-        missing_stats = pd.read_sql("""
-            SELECT br.id, br.player_id, br.game_stats_id
-            FROM bet_results br
-            LEFT JOIN game_stats gs ON br.game_stats_id = gs.id
-            WHERE gs.id IS NULL
-        """, conn)
-        if not missing_stats.empty:
-            log_issue(f"Found {len(missing_stats)} bet results with missing game stats")
-            print(missing_stats)
-
-        # 6. Validate date ranges
-        logging.info("Validating date ranges...")
-        
-        invalid_dates = pd.read_sql("""
-            SELECT id, date 
-            FROM raw_ocr_bets
-            WHERE date > CURRENT_DATE
-            OR date < '2023-01-01'
-        """, conn)
-        if not invalid_dates.empty:
-            log_issue(f"Found {len(invalid_dates)} bets with suspicious dates")
-            print(invalid_dates)
-
-        # 7. Check for unprocessed bets in unplayed_bets
-        logging.info("Checking unplayed bets consistency...")
-        
-        unplayed_issues = pd.read_sql("""
-            SELECT r.id, r.is_processed
-            FROM raw_ocr_bets r
-            JOIN unplayed_bets u ON r.id = u.raw_bet_id
-            WHERE r.is_processed = 0
-        """, conn)
-        if not unplayed_issues.empty:
-            log_issue(f"Found {len(unplayed_issues)} unplayed bets marked as unprocessed")
-            print(unplayed_issues)
-
-        # 8. Validate bet line format
-        logging.info("Validating bet line format...")
-        
-        invalid_lines = pd.read_sql("""
-            SELECT id, bet_line
-            FROM raw_ocr_bets
-            WHERE bet_line NOT LIKE 'o%' 
-            AND bet_line NOT LIKE 'u%'
-            AND bet_line IS NOT NULL
-        """, conn)
-        if not invalid_lines.empty:
-            log_issue(f"Found {len(invalid_lines)} bets with invalid bet line format")
-            print(invalid_lines)
+        # 1-8. Run every check in one UNION ALL query tagged by check name
+        logging.info("Running validation checks...")
+
+        issues = pd.read_sql(" UNION ALL ".join(
+            f"SELECT '{name}' AS check_name, row_id, detail FROM ({query})"
+            for name, _, query in VALIDATION_CHECKS
+        ), conn)
+        issues_by_check = {name: group for name, group in issues.groupby('check_name', sort=False)}
+
+        for name, message, _ in VALIDATION_CHECKS:
+            check_issues = issues_by_check.get(name)
+            if check_issues is not None:
+                log_issue(f"Found {len(check_issues)} {message}")
+                print(check_issues[['row_id', 'detail']])
 
         # 9. Summary statistics
         logging.info("Generating summary statistics...")
         
-        for table in ['raw_ocr_bets', 'bet_results', 'game_stats', 'unplayed_bets', 'players']:
-            count = pd.read_sql(f"SELECT COUNT(*) as count FROM {table}", conn).iloc[0]['count']
+        tables = ['raw_ocr_bets', 'bet_results', 'game_stats', 'unplayed_bets', 'players']
+        counts = conn.execute(
+            "SELECT " + ", ".join(f"(SELECT COUNT(*) FROM {table})" for table in tables)
+        ).fetchone()
+        for table, count in zip(tables, counts):
             logging.info(f"{table}: {count} rows")
 
         if not issues_found:
@@ -1,7 +1,20 @@
-import sqlite3
-import pandas as pd
+import csv
 from datetime import datetime
 import os
+import sys
+from pathlib import Path
+
+# Add the project root directory to Python path
+project_root = str(Path(__file__).parent.parent.parent)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from src.database.init_db import connect_db
+
+# Rows fetched and written per chunk when exporting a table
+EXPORT_CHUNK_SIZE = 50_000
+# Write buffer per CSV file, so each table is written with a few large write() calls
+EXPORT_BUFFER_SIZE = 4 * 1024 * 1024
 
 def export_database(db_file="sports_bets.db", output_dir=None):
     """Export database tables to CSV files with readable player names and dates."""
@@ -13,7 +26,7 @@ def export_database(db_file="sports_bets.db", output_dir=None):
     
     os.makedirs(output_dir, exist_ok=True)
     
-    conn = sqlite3.connect(db_file)
+    conn = connect_db(db_file)
     
     try:
         # Dictionary of table names and their corresponding queries
@@ -80,10 +93,17 @@ def export_database(db_file="sports_bets.db", output_dir=None):
         # Export each table
         for table_name, query in table_queries.items():
             try:
-                df = pd.read_sql_query(query, conn)
                 output_file = os.path.join(output_dir, f"{table_name}.csv")
-                df.to_csv(output_file, index=False)
-                print(f"Exported {table_name}: {len(df)} rows")
+                # Write rows straight from the cursor in chunks, so a large table never sits in memory whole
+                cursor = conn.execute(query)
+                row_count = 0
+                with open(output_file, 'w', newline='', buffering=EXPORT_BUFFER_SIZE) as f:
+                    writer = csv.writer(f)
+                    writer.writerow([column[0] for column in cursor.description])
+                    while rows := cursor.fetchmany(EXPORT_CHUNK_SIZE):
+                        writer.writerows(rows)
+                        row_count += len(rows)
+                print(f"Exported {table_name}: {row_count} rows")
             except Exception as e:
                 print(f"Error exporting {table_name}: {str(e)}")
                 
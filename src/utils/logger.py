@@ -47,5 +47,8 @@ def setup_logger(name: Optional[str] = None) -> logging.Logger:
         # Add handlers
         logger.addHandler(file_handler)
         logger.addHandler(console_handler)
+
+        # Don't pass records on to root handlers too (e.g. db_validation's basicConfig), which would log them twice
+        logger.propagate = False
     
     return logger 
\ No newline at end of file
@@ -2,114 +2,301 @@
 Google Sheets integration for uploading and tracking bet results.
 """
 
+import csv
 import json
+import logging
+import os
+import re
 import sqlite3
+from collections import defaultdict
+from datetime import date
+from functools import lru_cache
 from typing import Dict, List, Tuple, Any
 
 import gspread
+import numpy as np
 import pandas as pd
 from google.oauth2.service_account import Credentials
 
+from src.database.init_db import init_database, connect_db
 from src.utils.logger import setup_logger
-from src.utils.config import DB_PATH, CREDENTIALS_PATH, UPDATES_DIR
+from src.utils.config import CREDENTIALS_PATH, UPDATES_DIR
+from src.utils.constants import UPLOAD_MIN_BATCH, UPLOAD_MAX_WAIT_MINUTES
 from src.utils.sensitive.sheets_data import SHEET_NAME, WORKSHEET_NAME, SHEET_CELL_MAPPING
 
 logger = setup_logger(__name__)
 
-def upload_to_sheets(dry_run=False) -> None:
+_A1_CELL = re.compile(r'([A-Z]+)(\d+)')
+
+# Result and volume cell locations for each (bet_type, score_range)
+_MAPPING_DF = pd.DataFrame(
+    [(bet_type, score_range, SHEET_CELL_MAPPING[(bet_type, score_range, "Result")],
+      SHEET_CELL_MAPPING[(bet_type, score_range, "Volume")])
+     for (bet_type, score_range, kind) in SHEET_CELL_MAPPING if kind == "Result"],
+    columns=['bet_type', 'score_range', 'result_cell', 'volume_cell']
+)
+
+# Minutes are measured in SQLite, as processed_at is a UTC CURRENT_TIMESTAMP
+PENDING_UPLOADS_SQL = """
+SELECT COUNT(*), (julianday('now') - julianday(MIN(processed_at))) * 24 * 60
+FROM bet_results
+WHERE is_uploaded = 0
+"""
+
+UNUPLOADED_GROUPS_SQL = """
+SELECT bet_type, 
+    score_range, 
+    SUM(result_delta) AS ResultSum, 
+    COUNT(*) AS Count
+FROM bet_results
+WHERE is_uploaded = 0
+GROUP BY bet_type, score_range
+"""
+
+UNUPLOADED_LAST_DATE_SQL = """
+SELECT MAX(date)
+FROM bet_results
+WHERE is_uploaded = 0
+"""
+
+# Result and volume cells are separate rows, each saving only its own non-NULL column
+UPSERT_AGGREGATED_RESULT_SQL = """
+INSERT INTO aggregated_results 
+    (sheet_cell, bet_type, score_range, volume, result, updated_to, processed_at)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(sheet_cell) DO UPDATE SET
+    volume = COALESCE(excluded.volume, volume),
+    result = COALESCE(excluded.result, result),
+    updated_to = excluded.updated_to,
+    processed_at = excluded.processed_at
+"""
+
+def _split_cell(cell: str) -> Tuple[str, int]:
+    """Split an A1 cell location like 'B12' into its column and row ('B', 12)."""
+    match = _A1_CELL.fullmatch(cell)
+    if not match:
+        raise ValueError(f"Unsupported sheet cell location: {cell}")
+    return match.group(1), int(match.group(2))
+
+# (column, row) of every cell in SHEET_CELL_MAPPING, parsed once
+_CELL_POSITIONS = {cell: _split_cell(cell) for cell in SHEET_CELL_MAPPING.values()}
+
+def _sheet_number(value: Any) -> int | float:
+    """Convert an unformatted sheet value to a number, as an int when it is whole.
+
+    Numbers entered as text still arrive formatted (e.g. '$1,234'), so '$' and ',' are stripped from strings.
+    """
+    if isinstance(value, str):
+        value = float(value.replace('$', '').replace(',', '') or 0)
+    return int(value) if float(value).is_integer() else value
+
+def _column_ranges(cells: List[str]) -> Dict[str, Tuple[int, int]]:
+    """Get the (first row, last row) spanned by the cells in each column."""
+    ranges = {}
+    for cell in cells:
+        col, row = _CELL_POSITIONS[cell]
+        first, last = ranges.get(col, (row, row))
+        ranges[col] = (min(first, row), max(last, row))
+    return ranges
+
+@lru_cache(maxsize=1)
+def _get_worksheet(credentials_mtime: float) -> gspread.Worksheet:
+    """Authorize with the service account and open the results worksheet.
+
+    Cached so repeated uploads in one process reuse the client and worksheet.
+
+    Args:
+        credentials_mtime: Modification time of CREDENTIALS_PATH, so changed credentials reauthorize
+
+    Returns:
+        gspread.Worksheet: Worksheet holding the results and volumes
+    """
+    scope = ["https://www.googleapis.com/auth/spreadsheets", 
+            "https://www.googleapis.com/auth/drive"]
+
+    creds = Credentials.from_service_account_file(
+        CREDENTIALS_PATH,
+        scopes=scope
+    )
+    client = gspread.authorize(creds)
+    sheet = client.open(SHEET_NAME)
+    return sheet.worksheet(WORKSHEET_NAME)
+
+def upload_to_sheets(dry_run=False, min_batch: int = UPLOAD_MIN_BATCH,
+                     max_wait_minutes: float = UPLOAD_MAX_WAIT_MINUTES) -> None:
     """Upload results to Google Sheets
 
+    Defers the upload while fewer than min_batch results are pending and the oldest has waited less than max_wait_minutes.
     Calculates the sum of results and counts the number of bets for each bet type and score range, corresponding to a cell in the Google Sheet.
     Updates Google Sheet with the adjusted results and volumes.
     Marks the bets as uploaded in the bet_results table.
     Logs the summary of all updates
     
     Args:
-        dry_run (bool): If True, log changes without applying them
+        dry_run (bool): If True, log changes without applying them (never deferred)
+        min_batch (int): Pending results needed to upload before max_wait_minutes; 0 always uploads
+        max_wait_minutes (float): Longest a pending result waits for the batch to fill
     
     Database:
-        Reads from raw_ocr_bets (raw_bet_id, bet_line, odds, date, score), players (name, nba_api_id), bet_results (id, is_uploaded)
-        Updates bet_results table (is_uploaded)
+        Reads from bet_results (id, bet_type, score_range, result_delta, date, is_uploaded),
+            aggregated_results (sheet_cell, result, volume)
+        Updates bet_results table (is_uploaded), aggregated_results table
 
     Returns:    
         bool: True if upload successful, False otherwise
     """
     conn = None
     try:
-        scope = ["https://www.googleapis.com/auth/spreadsheets", 
-                "https://www.googleapis.com/auth/drive"]
-
-        creds = Credentials.from_service_account_file(
-            CREDENTIALS_PATH,
-            scopes=scope
-        )
-        client = gspread.authorize(creds)
-        sheet = client.open(SHEET_NAME)
-        worksheet = sheet.worksheet(WORKSHEET_NAME)
+        init_database()  # Ensures tables exist and legacy aggregated results are reset
+        conn = connect_db()
 
-        conn = sqlite3.connect(DB_PATH)
+        if not dry_run and _should_defer_upload(conn, min_batch, max_wait_minutes):
+            return True
 
-        unuploaded_bets = _get_unuploaded_bets(conn)
-        if unuploaded_bets.empty:
+        grouped_bets, last_date, bet_ids = _get_unuploaded_bets(conn)
+        if not bet_ids:
             logger.info("No unuploaded bets to process.")
             return True
 
-        grouped_bets = _group_bets(unuploaded_bets)
-        last_date = unuploaded_bets["date"].max()
-        logger.info(f"Processing {len(unuploaded_bets)} new uploads")
+        logger.info(f"Processing {len(bet_ids)} new uploads")
+
+        # Only connect to Google Sheets once there is something to upload
+        worksheet = _get_worksheet(os.path.getmtime(CREDENTIALS_PATH))
 
-        updates = _get_updates(worksheet, grouped_bets, last_date)
+        # One transaction for the saved totals and uploaded flags, committed only after the sheet is updated
+        with conn:
+            updates = _get_updates(conn, worksheet, grouped_bets, last_date, dry_run)
 
-        if not dry_run:
-            worksheet.batch_update(updates)
-            _mark_bets_as_uploaded(conn, unuploaded_bets['bet_id'])
-            logger.info(f"Batch update completed successfully with {len(unuploaded_bets)} uploads")
+            if not dry_run:
+                worksheet.batch_update(updates, value_input_option='RAW')
+                _mark_bets_as_uploaded(conn, bet_ids)
+                logger.info(f"Batch update completed successfully with {len(bet_ids)} uploads")
             
         return True
 
     except Exception as e:
         logger.error(f"Upload failed: {str(e)}", exc_info=True)
+        # Reconnect on the next upload in case the cached worksheet handle caused the failure
+        _get_worksheet.cache_clear()
         return False
 
     finally:
         if conn:
             conn.close()
 
-def _get_unuploaded_bets(conn) -> pd.DataFrame:
-    """Get unuploaded bet results from database."""
-    query = """
-    SELECT br.id as bet_id, 
-        p.name as player, 
-        br.bet_type, 
-        br.result, 
-        br.result_delta, 
-        br.score_range, 
-        r.bet_line, 
-        r.odds, 
-        r.date,
-        r.score
-    FROM bet_results br
-    JOIN raw_ocr_bets r ON br.raw_bet_id = r.id
-    JOIN players p ON br.player_id = p.nba_api_id
-    WHERE br.is_uploaded = 0
-    ORDER BY br.id 
+def _should_defer_upload(conn, min_batch: int, max_wait_minutes: float) -> bool:
+    """Check if the pending results should wait for a larger batch before uploading."""
+    pending, oldest_minutes = conn.execute(PENDING_UPLOADS_SQL).fetchone()
+    if pending == 0 or pending >= min_batch or oldest_minutes >= max_wait_minutes:
+        return False
+
+    logger.info(
+        f"Deferring upload of {pending} results until {min_batch} are pending "
+        f"or the oldest has waited {max_wait_minutes} minutes ({oldest_minutes:.0f} so far)"
+    )
+    return True
+
+def _get_unuploaded_bets(conn) -> Tuple[pd.DataFrame, str, List[int]]:
+    """Get unuploaded bet results aggregated by bet_type and score_range.
+
+    All queries read from the same snapshot, so the returned ids are exactly the bets in the aggregates.
+
+    Args:
+        conn: Database connection
+
+    Returns:
+        Tuple[grouped, last_date, bet_ids] where
+            grouped = DataFrame of bet_type, score_range, ResultSum and Count
+            last_date = Date of the last unuploaded bet
+            bet_ids = ids of the unuploaded bet_results
     """
-    return pd.read_sql_query(query, conn)
+    conn.execute("BEGIN")
+    try:
+        cursor = conn.execute(UNUPLOADED_GROUPS_SQL)
+        grouped = pd.DataFrame.from_records(cursor.fetchall(), columns=[col[0] for col in cursor.description])
+        last_date = conn.execute(UNUPLOADED_LAST_DATE_SQL).fetchone()[0]
+        bet_ids = [bet_id for (bet_id,) in conn.execute("SELECT id FROM bet_results WHERE is_uploaded = 0")]
+    finally:
+        conn.commit()
+    return grouped, last_date, bet_ids
 
-def _group_bets(bets: pd.DataFrame) -> pd.DataFrame:
-    """Group bets by bet_type and score_range and aggregate results and volumes."""
-    return bets.groupby(['bet_type', 'score_range']).agg(
-        ResultSum=('result_delta', 'sum'),
-        Count=('result_delta', 'size')
-    ).reset_index()
+def _attach_sheet_cells(grouped: pd.DataFrame) -> pd.DataFrame:
+    """Add the result_cell and volume_cell sheet locations of each grouped bet.
 
-def _get_current_values(worksheet: gspread.Worksheet, grouped: pd.DataFrame) -> tuple[dict, dict]:
+    Raises:
+        KeyError: If a (bet_type, score_range) has no cells in SHEET_CELL_MAPPING
     """
-    Get current values from Google Sheet for results and volumes of grouped. 
+    merged = grouped.merge(_MAPPING_DF, on=['bet_type', 'score_range'], how='left')
+    unmapped = merged['result_cell'].isna()
+    if unmapped.any():
+        missing = list(merged.loc[unmapped, ['bet_type', 'score_range']].itertuples(index=False, name=None))
+        raise KeyError(f"No sheet cells mapped for {missing}")
+    return merged
+
+def _get_recorded_values(conn, cells: List[str]) -> Dict[str, Tuple[Any, Any]]:
+    """Get the totals last saved to aggregated_results for the given sheet cells.
+
+    Args:
+        conn: Database connection
+        cells: Sheet cell locations
+
+    Returns:
+        Dict[str, Tuple[result, volume]]: {cell location: (result, volume)} for cells with a saved row
+    """
+    recorded = {}
+    chunk_size = conn.getlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER)
+    for start in range(0, len(cells), chunk_size):
+        chunk = cells[start:start + chunk_size]
+        query = f"""
+        SELECT sheet_cell, result, volume 
+        FROM aggregated_results 
+        WHERE sheet_cell IN ({','.join('?' * len(chunk))})
+        """
+        for cell, result, volume in conn.execute(query, chunk):
+            recorded[cell] = (result, volume)
+    return recorded
+
+def _read_sheet_values(worksheet: gspread.Worksheet, cells: List[str]) -> Dict[str, Any]:
+    """
+    Read the given cells from Google Sheet.
+
+    Batch gets one contiguous range per column spanning the cells.
+    Unformatted values come back as numbers, so no '$' or ',' parsing is needed.
+
+    Args:
+        worksheet: Google Sheet worksheet
+        cells: Sheet cell locations
+
+    Returns:
+        Dict[str, Any]: {cell location: value}, with empty cells reading as 0
+    """
+    col_ranges = _column_ranges(cells)
+    all_values = worksheet.batch_get(
+        [f"{col}{first}" if first == last else f"{col}{first}:{col}{last}" for col, (first, last) in col_ranges.items()],
+        value_render_option='UNFORMATTED_VALUE'
+    )
+
+    # Map each cell location in the ranges to its value (trailing empty rows are omitted)
+    sheet_values = {}
+    for (col, (first, _)), rows in zip(col_ranges.items(), all_values):
+        for offset, row in enumerate(rows):
+            if row:
+                sheet_values[f"{col}{first + offset}"] = row[0]
+
+    # Empty cells have nothing recorded yet
+    return {cell: _sheet_number(sheet_values.get(cell, 0)) for cell in cells}
+
+def _get_current_values(conn, worksheet: gspread.Worksheet, grouped: pd.DataFrame) -> tuple[dict, dict]:
+    """
+    Get current values for results and volumes of grouped.
+
+    aggregated_results holds the totals last written to the sheet, so it is read first.
+    Google Sheet is only read for cells without a saved total (e.g. the first upload to a cell).
     
     Args:
+        conn: Database connection
         worksheet: Google Sheet worksheet
-        grouped: DataFrame of grouped bets
+        grouped: DataFrame of grouped bets with result_cell and volume_cell columns
         
     Returns:
         tuple[results, volumes] where 
@@ -117,187 +304,190 @@ def _get_current_values(worksheet: gspread.Worksheet, grouped: pd.DataFrame) ->
             volumes = {cell location: current volume}
     """
     # Get cell location of result and volume for each grouped bet
-    result_cells = [SHEET_CELL_MAPPING[(row["bet_type"], row["score_range"], "Result")] 
-                    for _, row in grouped.iterrows()]
-    volume_cells = [SHEET_CELL_MAPPING[(row["bet_type"], row["score_range"], "Volume")] 
-                    for _, row in grouped.iterrows()]
-
-    # Batch get all values in result_cells and volume_cells
-    all_cells = result_cells + volume_cells
-    all_values = worksheet.batch_get(all_cells)
+    result_cells = grouped['result_cell'].tolist()
+    volume_cells = grouped['volume_cell'].tolist()
+
+    # Create maps of cell locations to current values, None where there is no saved total
+    recorded = _get_recorded_values(conn, result_cells + volume_cells)
+    current_results = {cell: recorded.get(cell, (None, None))[0] for cell in result_cells}
+    current_volumes = {cell: recorded.get(cell, (None, None))[1] for cell in volume_cells}
+
+    # Fall back to Google Sheet for cells with no saved total
+    missing_results = [cell for cell, value in current_results.items() if value is None]
+    missing_volumes = [cell for cell, value in current_volumes.items() if value is None]
+    if missing_results or missing_volumes:
+        logger.info(f"Reading {len(missing_results) + len(missing_volumes)} cells without saved totals from Google Sheet")
+        sheet_values = _read_sheet_values(worksheet, missing_results + missing_volumes)
+        current_results.update({cell: sheet_values[cell] for cell in missing_results})
+        current_volumes.update({cell: int(sheet_values[cell]) for cell in missing_volumes})
 
-    # Split and process values
-    results_values = all_values[:len(result_cells)]
-    volumes_values = all_values[len(result_cells):]
+    return current_results, current_volumes
 
-    # Create maps of cell locations to current values
-    current_results = {cell: int(val[0][0].replace('$', '').replace(',', '')) 
-                 for cell, val in zip(result_cells, results_values)}
-    current_volumes = {cell: int(val[0][0]) 
-                 for cell, val in zip(volume_cells, volumes_values)}
+def _save_aggregated_results_batch(conn, rows: List[Tuple]) -> None:
+    """Save aggregated results to the database in the caller's transaction.
 
-    return current_results, current_volumes
+    Updates existing records if sheet_cells exist, otherwise inserts new records.
 
-def _save_aggregated_results(bet_group: pd.Series, last_date: str, new_result: int, new_volume: int) -> None:
-    """Save aggregated results to the database. Updates existing records if sheet_cells exist, otherwise inserts new records."""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
+    Args:
+        conn: Database connection
+        rows: (sheet_cell, bet_type, score_range, volume, result, updated_to, processed_at) tuples,
+            with volume None for result cells and result None for volume cells
+    """
     try:
-        # Save result cell data
-        result_cell = SHEET_CELL_MAPPING[(bet_group["bet_type"], bet_group["score_range"], "Result")]
-        cursor.execute("""
-        INSERT INTO aggregated_results 
-            (sheet_cell, bet_type, score_range, volume, result, updated_to, processed_at)
-        VALUES (?, ?, ?, NULL, ?, ?, ?)
-        ON CONFLICT(sheet_cell) DO UPDATE SET
-            result = excluded.result,
-            updated_to = excluded.updated_to,
-            processed_at = excluded.processed_at
-        """, (
-            result_cell,
-            bet_group["bet_type"],
-            bet_group["score_range"],
-            new_result,
-            last_date,
-            pd.Timestamp.now().strftime('%Y-%m-%d')   
-        ))
-
-        # Save volume cell data
-        volume_cell = SHEET_CELL_MAPPING[(bet_group["bet_type"], bet_group["score_range"], "Volume")]
-        cursor.execute("""
-        INSERT INTO aggregated_results 
-            (sheet_cell, bet_type, score_range, volume, result, updated_to, processed_at)
-        VALUES (?, ?, ?, ?, NULL, ?, ?)
-        ON CONFLICT(sheet_cell) DO UPDATE SET
-            volume = excluded.volume,
-            updated_to = excluded.updated_to,
-            processed_at = excluded.processed_at
-        """, (
-            volume_cell,
-            bet_group["bet_type"],
-            bet_group["score_range"],
-            new_volume,
-            last_date,
-            pd.Timestamp.now().strftime('%Y-%m-%d')   
-        ))
-
-        conn.commit()
+        conn.executemany(UPSERT_AGGREGATED_RESULT_SQL, rows)
     except Exception as e:
-        conn.rollback()
         logger.error(f"Error saving aggregated results: {str(e)}")
         raise
-    finally:
-        conn.close()
 
-def _create_updates(grouped_bets: pd.DataFrame, current_results: dict, current_volumes: dict, last_date: str, dry_run: bool) -> list[dict]:
-    """Create updates for Google Sheets.
+def _create_updates(conn, grouped_bets: pd.DataFrame, current_results: dict, current_volumes: dict, last_date: str, dry_run: bool) -> List[Tuple[str, Any]]:
+    """Create the new cell values for Google Sheets.
     
     Args:
-        grouped_bets: DataFrame of bets grouped by bet_type and score_range
+        conn: Database connection used to save the aggregated results
+        grouped_bets: DataFrame of bets grouped by bet_type and score_range, with result_cell and volume_cell columns
         current_results: Dictionary of current results {cell_location: result}
         current_volumes: Dictionary of current volumes {cell_location: volume}
         last_date: Date of the last processed bet
         dry_run: Boolean indicating if the update is a dry run 
     
     Returns:
-        list[dict]: List of update dictionaries {range: [values]}
+        List[Tuple[str, Any]]: List of (cell_location, new value) pairs
     """
-    updates = []
-    update_records = []
-    for _, bet_group in grouped_bets.iterrows():
-        # Locations for updates
-        result_cell = SHEET_CELL_MAPPING[(bet_group["bet_type"], bet_group["score_range"], "Result")]
-        volume_cell = SHEET_CELL_MAPPING[(bet_group["bet_type"], bet_group["score_range"], "Volume")]
-
-        # Current values to be updated
-        curr_result = current_results[result_cell]
-        curr_volume = current_volumes[volume_cell]
-
-        # Calculate new values
-        result_delta = bet_group["ResultSum"]
-        volume_delta = bet_group["Count"]
-        new_result = curr_result + result_delta
-        new_volume = curr_volume + volume_delta
-
-        # Update aggregated results in database
-        _save_aggregated_results(bet_group, last_date, new_result, new_volume)
-
-        # Collect update information for logging
-        update_records.extend([
-            {
-                'Bet Type': bet_group['bet_type'],
-                'Score Range': bet_group['score_range'],
-                'Location': result_cell,
-                'Type': 'Result',
-                'Current': curr_result,
-                'Change': result_delta,
-                'New Value': new_result
-            },
-            {
-                'Bet Type': bet_group['bet_type'],
-                'Score Range': bet_group['score_range'],
-                'Location': volume_cell,
-                'Type': 'Volume',
-                'Current': curr_volume,
-                'Change': volume_delta,
-                'New Value': new_volume
-            }
-        ])
-
-        # Add updates to return list (naming required by Google Sheets API)
-        updates.append({"range": result_cell, "values": [[new_result]]})
-        updates.append({"range": volume_cell, "values": [[new_volume]]})
-
-    _log_updates(update_records, dry_run)
-
-    return updates
-
-def _log_updates(update_records: list[dict], dry_run: bool) -> None:
-    """Log update information using a DataFrame."""
-    # Create and log summary DataFrame
-    update_df = pd.DataFrame(update_records)
-    
-    # Ensure full DataFrame is displayed in logger
-    with pd.option_context('display.max_rows', None, 'display.max_columns', None):
+    processed_at = date.today().isoformat()
+
+    # Locations, current values and deltas as arrays aligned with grouped_bets
+    bet_types = grouped_bets['bet_type'].to_numpy()
+    score_ranges = grouped_bets['score_range'].to_numpy()
+    result_cells = grouped_bets['result_cell'].to_numpy()
+    volume_cells = grouped_bets['volume_cell'].to_numpy()
+    curr_results = grouped_bets['result_cell'].map(current_results).to_numpy()
+    curr_volumes = grouped_bets['volume_cell'].map(current_volumes).to_numpy()
+    result_deltas = grouped_bets['ResultSum'].to_numpy()
+    volume_deltas = grouped_bets['Count'].to_numpy()
+
+    # Calculate new values
+    new_results = curr_results + result_deltas
+    new_volumes = curr_volumes + volume_deltas
+
+    # Save aggregated results in database (tolist converts to Python scalars sqlite3 can bind)
+    if not dry_run:
+        n_groups = len(grouped_bets)
+        dates = [last_date] * n_groups
+        processed = [processed_at] * n_groups
+        missing = [None] * n_groups
+        rows = list(zip(result_cells.tolist(), bet_types.tolist(), score_ranges.tolist(),
+                        missing, new_results.tolist(), dates, processed))
+        rows.extend(zip(volume_cells.tolist(), bet_types.tolist(), score_ranges.tolist(),
+                        new_volumes.tolist(), missing, dates, processed))
+        _save_aggregated_results_batch(conn, rows)
+
+    # Update information for logging, with the result row of each group followed by its volume row
+    def interleave(results: np.ndarray, volumes: np.ndarray) -> np.ndarray:
+        column = np.empty(2 * len(results), dtype=np.result_type(results, volumes))
+        column[0::2] = results
+        column[1::2] = volumes
+        return column
+
+    update_columns = {
+        'Bet Type': np.repeat(bet_types, 2),
+        'Score Range': np.repeat(score_ranges, 2),
+        'Location': interleave(result_cells, volume_cells),
+        'Type': np.tile(['Result', 'Volume'], len(grouped_bets)),
+        'Current': interleave(curr_results, curr_volumes),
+        'Change': interleave(result_deltas, volume_deltas),
+        'New Value': interleave(new_results, new_volumes)
+    }
+    _log_updates(update_columns, dry_run)
+
+    # New value of each cell to update
+    cell_values = list(zip(result_cells.tolist(), new_results.tolist()))
+    cell_values.extend(zip(volume_cells.tolist(), new_volumes.tolist()))
+    return cell_values
+
+def _log_updates(update_columns: Dict[str, np.ndarray], dry_run: bool) -> None:
+    """Log update information and save it to a CSV.
+
+    Args:
+        update_columns: Summary columns {column name: values}, one row per updated cell
+        dry_run: Boolean indicating if the update is a dry run
+    """
+    # to_string renders every row and column without changing the global display options,
+    # and the DataFrame is only built when the summary will be logged
+    if logger.isEnabledFor(logging.INFO):
         logger.info("\nUpdate Summary:")
-        logger.info("\n" + str(update_df))
+        logger.info("\n" + pd.DataFrame(update_columns).to_string())
     
-    # Save to CSV with timestamp
-    timestamp = pd.Timestamp.now().strftime('%Y%m%d')
+    # Save to CSV with timestamp (tolist gives Python scalars, which csv writes like to_csv did)
+    timestamp = date.today().strftime('%Y%m%d')
     csv_path = UPDATES_DIR / f'updates_{timestamp}.csv'
-    update_df.to_csv(csv_path, index=False)
+    with open(csv_path, 'w', newline='') as f:
+        writer = csv.writer(f, lineterminator='\n')
+        writer.writerow(update_columns.keys())
+        writer.writerows(zip(*(values.tolist() for values in update_columns.values())))
     logger.info(f"Update details saved to: {csv_path}")
     
     if dry_run:
         logger.info("\nDRY RUN - No changes will be made to the database")
 
-def _get_updates(worksheet: gspread.Worksheet, grouped: pd.DataFrame, last_date: str) -> list[dict]:
+def _coalesce_updates(cell_values: List[Tuple[str, Any]]) -> list[dict]:
+    """Build range updates, merging cells in adjacent rows of the same column into one range.
+    
+    Args:
+        cell_values: List of (cell_location, new value) pairs
+    
+    Returns:
+        list[dict]: List of update dictionaries covering contiguous ranges {range: [values]} (naming required by Google Sheets API)
+    """
+    values_by_col = defaultdict(dict)
+    for cell, value in cell_values:
+        col, row = _CELL_POSITIONS[cell]
+        values_by_col[col][row] = [value]
+
+    coalesced = []
+    for col, rows in values_by_col.items():
+        runs = []
+        for row in sorted(rows):
+            if runs and row == runs[-1][-1] + 1:
+                runs[-1].append(row)
+            else:
+                runs.append([row])
+        for run in runs:
+            cell_range = f"{col}{run[0]}" if len(run) == 1 else f"{col}{run[0]}:{col}{run[-1]}"
+            coalesced.append({"range": cell_range, "values": [rows[row] for row in run]})
+    return coalesced
+
+def _get_updates(conn, worksheet: gspread.Worksheet, grouped: pd.DataFrame, last_date: str, dry_run: bool) -> list[dict]:
     """
     Get batch updates for Google Sheets.
     
     Args:
+        conn: Database connection
         worksheet: Google Sheet worksheet
-        grouped: DataFrame of grouped bets        
+        grouped: DataFrame of grouped bets
+        last_date: Date of the last processed bet
+        dry_run: If True, the new totals are not saved to the database
     Returns:
         list[dict]: List of update dictionaries
     """
-    current_results, current_volumes = _get_current_values(worksheet, grouped)
-    updates = _create_updates(grouped, current_results, current_volumes, last_date, dry_run=False)
-    return updates
+    grouped = _attach_sheet_cells(grouped)
+    current_results, current_volumes = _get_current_values(conn, worksheet, grouped)
+    cell_values = _create_updates(conn, grouped, current_results, current_volumes, last_date, dry_run)
+    return _coalesce_updates(cell_values)
 
 def _mark_bets_as_uploaded(conn, bet_ids: list[int]):
-    """Mark bets as uploaded in bet_results table."""
-    cursor = conn.cursor()
+    """Mark bets as uploaded in bet_results table, in the caller's transaction."""
+    # Only the aggregated ids, since bets may have been processed since they were read
+    chunk_size = conn.getlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER)
     try:
-        cursor.executemany("""
-            UPDATE bet_results 
-            SET is_uploaded = 1 
-            WHERE id = ?
-        """, [(id,) for id in bet_ids])
-        conn.commit()
+        for start in range(0, len(bet_ids), chunk_size):
+            chunk = bet_ids[start:start + chunk_size]
+            conn.execute(f"""
+                UPDATE bet_results 
+                SET is_uploaded = 1 
+                WHERE id IN ({','.join('?' * len(chunk))})
+            """, chunk)
         logger.info(f"{len(bet_ids)} bets marked as uploaded in database")
     except Exception as e:
-        conn.rollback()
         logger.error(f"Failed to mark bets as uploaded: {str(e)}", exc_info=True)
         raise
 